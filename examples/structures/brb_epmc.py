@@ -76,10 +76,15 @@ Parallelism:
     >> export OMP_PROC_BIND=spread # Spread threads out over physical cores
     >> export OMP_NUM_THREADS=32 # Change 32 to desired number of threads
 
-    The JAX evaluations of the nonlinear forces are JIT compiled and are called
-    in a non-blocking fashion by default. In practical terms, this means all
-    threads will be used to simultaneously execute the nonlinear force 
-    evaluations.
+    The JAX evaluations of the nonlinear forces are JIT compiled and all 
+    contact elements are evaluated by a single nonlinear force. By default, 
+    JAX uses a single CPU device. To split the contact elements between 
+    several CPU devices so they are evaluated simultaneously, pass 
+    `use_pmap=True` to `RoughContactFriction.from_batch` below and set the 
+    environment variable before running (Change 32 to desired number of 
+    devices):
+        
+    >> export XLA_FLAGS=--xla_force_host_platform_device_count=32
     
 Simulations with 122 ZTE model take about 5-10 minutes on Computer with 
 12 cores, 24 threads, 32 GB RAM, 2.1 GHz processor
@@ -110,8 +115,11 @@ References
 """
 
 import sys
+
 import numpy as np
 from scipy import io as sio
+import scipy.linalg
+import scipy.sparse
 from scipy.interpolate import LinearNDInterpolator
 import warnings
 import time
@@ -210,7 +218,11 @@ else:
 # Surface Parameters for the rough contact model - from ref [1]
 surface_fname = './data/brb_surface_data.mat'
 
-surface_pars = sio.loadmat(surface_fname)
+# Only load the fields that are used here
+surface_pars = sio.loadmat(surface_fname, 
+                           variable_names=['Re', 'area_density', 'z_max', 
+                                           'normzinterp', 'pzinterp', 
+                                           'mesoscale_xygap'])
 
 ElasticMod = 192.31e9 # Pa
 PoissonRatio = 0.3
@@ -227,9 +239,10 @@ pzinterp    = surface_pars['pzinterp'][0]
 
 gaps = np.linspace(0, 1.0, 101) * max_gap
 
-trap_weights = np.ones_like(gaps)
-trap_weights[1:-1] = 2.0
-trap_weights = trap_weights / trap_weights.sum()
+# Trapezoid rule weights (1, 2, ..., 2, 1) normalized to sum to 1
+Ngaps = gaps.shape[0]
+trap_weights = np.where(np.arange(Ngaps) % (Ngaps-1) == 0, 1.0, 2.0) \
+                    / (2.0*(Ngaps-1))
 
 gap_weights = area_density * trap_weights * np.interp(gaps/max_gap, 
                                                       normzinterp, pzinterp)
@@ -364,7 +377,11 @@ callback_funs = lambda XlamP, dirP_prev : cont_utils.combine_callback_funs(\
 # This block is just sanity checks that the system is what is expected. 
 # This should not be editted. 
 
-system_matrices = sio.loadmat(system_fname)
+# Only load the fields that are used here (e.g., skipping element 
+# connectivity)
+system_matrices = sio.loadmat(system_fname, 
+                              variable_names=['M', 'K', 'L', 'Fv', 'R', 
+                                              'Qm', 'Tm', 'node_coords'])
 
 ######## Sanity Checks on Loaded Matrices
 
@@ -423,17 +440,25 @@ vib_sys = VibrationSystem(system_matrices['M'], system_matrices['K'],
 # Number of nonlinear frictional elements, Number of Nodes
 Nnl,Nnodes = system_matrices['Qm'].shape 
 
-# Need to convert sparse loads into arrays so that operations are expected shapes
-# Sparse matrices from matlab are loaded as matrices rather than numpy arrays
-# and behave differently than numpy arrays.
-Qm = np.array(system_matrices['Qm'].todense()) 
-Tm = np.array(system_matrices['Tm'].todense())
+# Keep the interpolation matrices from matlab sparse. They are converted to
+# csr format so that products with dense arrays return numpy arrays.
+Qm = scipy.sparse.csr_matrix(system_matrices['Qm'])
+Tm = scipy.sparse.csr_matrix(system_matrices['Tm'])
 
 # Pull out for reference convenience - null space transformation matrix
 L  = system_matrices['L']
 
-QL = np.kron(Qm, np.eye(3)) @ L[:3*Nnodes, :]
-LTT = L[:3*Nnodes, :].T @ np.kron(Tm, np.eye(3))
+# Rows of L corresponding to the interface nodes (3 DOFs per node), 
+# shared by both transformations below
+L_contact = L[:3*Nnodes, :]
+
+# Sparse kron with identity avoids forming the dense block matrices, 
+# products with dense L are dense arrays
+Qm3 = scipy.sparse.kron(Qm, scipy.sparse.eye(3), format='csr')
+Tm3 = scipy.sparse.kron(Tm, scipy.sparse.eye(3), format='csc')
+
+QL = Qm3 @ L_contact
+LTT = L_contact.T @ Tm3
 
 
 # Calculate the mesoscale gaps of each node point
@@ -452,18 +477,19 @@ meso_gap_quads = meso_gap_quads - meso_gap_quads.min()
 # Set mesoscale to zero if not using it
 meso_gap_quads = mesoscale_TF * meso_gap_quads 
 
-for i in range(Nnl):
-    
-    Ls = (QL[i*3:(i*3+3), :])
-    Lf = (LTT[:, i*3:(i*3+3)])
+# Stack the transformations of each element: (Nnl, 3, N) and (Nnl, N, 3)
+Ls_all = QL.reshape(Nnl, 3, -1)
+Lf_all = LTT.reshape(-1, Nnl, 3).transpose(1, 0, 2)
+
+# A single nonlinear force evaluates all of the elements together
+nl_force = RoughContactFriction.from_batch(Ls_all, Lf_all, ElasticMod,
+                                           PoissonRatio, Radius, TangentMod,
+                                           YieldStress, mu,
+                                           gaps=gaps, gap_weights=gap_weights,
+                                           meso_gap=meso_gap_quads)
+
+vib_sys.add_nl_force(nl_force)
 
-    tmp_nl_force = RoughContactFriction(Ls, Lf, ElasticMod, PoissonRatio, 
-                                        Radius, TangentMod, YieldStress, mu,
-                                        gaps=gaps, gap_weights=gap_weights,
-                                        meso_gap=meso_gap_quads[i])
-    
-    vib_sys.add_nl_force(tmp_nl_force)
-    
     
 # Create a reference nonlinear element that can be used for initial guesses
 # e.g., to extract an estimate of the stiffness
@@ -488,25 +514,27 @@ t, dtduxyn = ref_nlforce.force(uxyn_est)
 
 # linearized stiffness matrix with normal contact friction 
 # Tangent friction is set to zero for prestress so do the same here.
-Kstuck = np.zeros((L.shape[0], L.shape[0]))
+# Only the normal DOF of each node has stiffness (kn_mat between the normal 
+# DOFs of the nodes). Therefore, L.T @ Kstuck @ L only needs the rows of L 
+# for the normal DOFs rather than forming the mostly zero 
+# (L.shape[0], L.shape[0]) Kstuck.
+kn_mat = Tm @ (float(dtduxyn[2,2]) * Qm)
 
-place_normal = np.eye(3)
-place_normal[0,0] = 0
-place_normal[1,1] = 0
-kn_mat = Tm @ (dtduxyn[2,2] * Qm)
-Kstuck[:3*Nnodes, :3*Nnodes] += np.kron(kn_mat, place_normal)
+L_normal = np.ascontiguousarray(L_contact[2::3, :])
 
-K0 = system_matrices['K'] + L.T @ Kstuck @ L
+K0 = system_matrices['K'] + L_normal.T @ (kn_mat @ L_normal)
 
 # Calculate an initial guess
-X0 = np.linalg.solve(K0,(Fv * prestress))
+# K0 is symmetric positive definite, so a Cholesky factorization is used 
+# rather than a general LU solve.
+K0_factor = scipy.linalg.cho_factor(K0)
+X0 = scipy.linalg.cho_solve(K0_factor, Fv * prestress)
 
 # function to solve
 pre_fun = lambda U, calc_grad=True : vib_sys.static_res(U, Fv*prestress)
 
-R0, dR0dX = pre_fun(X0)
-
-print('Residual norm of initial guess: {:.4e}'.format(np.linalg.norm(dR0dX)))
+# The residual of the initial guess is reported as the first iteration of the
+# verbose nonlinear solver, so it is not separately evaluated here.
 
 if run_profilers:
     
@@ -560,6 +588,8 @@ vib_sys.reset_real_mu()
 ###############################################################################
 
 # Recalculate stiffness with real mu (including stiffness from friction)
+# The Jacobian from the static solve cannot be reused since it has mu=0 and 
+# the history variables have since been updated.
 Rpre, dRpredX = vib_sys.static_res(Xpre, Fv*prestress)
 
 sym_check = np.max(np.abs(dRpredX - dRpredX.T))
@@ -577,8 +607,8 @@ eigvals, eigvecs = static_solver.eigs(Kpre, system_matrices['M'],
 print('Prestress State Frequencies: [Hz]')
 print(np.sqrt(eigvals)/(2*np.pi))
 
-# Mass normalize eigenvectors
-norm = np.diag(eigvecs.T @ system_matrices['M'] @ eigvecs)
+# Mass normalize eigenvectors (only the diagonal of eigvecs.T @ M @ eigvecs)
+norm = np.einsum('ij,ij->j', eigvecs, system_matrices['M'] @ eigvecs)
 eigvecs = eigvecs / np.sqrt(norm)
 
 # Displacement at accel for eigenvectors
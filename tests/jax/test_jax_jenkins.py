@@ -366,6 +366,92 @@ class TestJAXJenkins(unittest.TestCase):
         self.assertFalse(grad_failed, 'Incorrect Gradient from u0 setting.')
         # Gradients are correct?
         
+    def test_calc_grad_opt(self):
+        """
+        Test that AFT without gradients returns the same force
+        
+        Returns
+        -------
+        None.
+        
+        """
+        
+        h = np.array([0, 1, 2, 3])
+        Unl = 5*np.array([[0.75, 2.0, 1.3, 0.0, 0.0, 1.0, 0.0]]).T
+        
+        w = 1.7
+        Nt = 1 << 7
+        
+        res_default = self.jenkins_force.aft(Unl, w, h, Nt=Nt)
+        res_no_grad = self.jenkins_force.aft(Unl, w, h, Nt=Nt, calc_grad=False)
+        
+        self.assertEqual(len(res_default), 3, 
+                         'Default AFT returns wrong number of outputs')
+        self.assertEqual(len(res_no_grad), 1, 
+                         'No Grad AFT returns wrong number of outputs')
+        
+        self.assertLess(np.max(np.abs(res_default[0] - res_no_grad[0])), 
+                        1e-15, 'No grad option on AFT is returning wrong force.')
+        
+    def test_multiple_elements(self):
+        """
+        Test that several elements in one force match separate elements
+        
+        Returns
+        -------
+        None.
+        
+        """
+        
+        h = np.array([0, 1, 2, 3])
+        w = 1.7
+        Nt = 1 << 7
+        
+        # Three global DOFs, two elements with different parameters
+        Q = np.array([[1.0, -1.0, 0.0], 
+                      [0.0, 1.0, 0.5]])
+        T = Q.T
+        
+        kt = np.array([2.0, 1.5])
+        Fs = np.array([3.0, 0.4])
+        u0 = np.array([0.1, -0.2])
+        
+        combined = JenkinsForce(Q, T, kt, Fs, u0=u0)
+        
+        separate = [JenkinsForce(Q[i:i+1, :], T[:, i:i+1], kt[i], Fs[i], 
+                                 u0=u0[i:i+1]) for i in range(2)]
+        
+        # First element is stuck and second element slips
+        rng = np.random.default_rng(1023)
+        U = rng.random(Q.shape[1]*7)
+        
+        Fnl, dFnldU, dFnldw = combined.aft(U, w, h, Nt=Nt)
+        
+        Fnl_sep = np.zeros_like(Fnl)
+        dFnldU_sep = np.zeros_like(dFnldU)
+        
+        for fnl_force in separate:
+            Fnl_curr, dFnldU_curr, _ = fnl_force.aft(U, w, h, Nt=Nt)
+            
+            Fnl_sep += Fnl_curr
+            dFnldU_sep += dFnldU_curr
+            
+        self.assertLess(np.max(np.abs(Fnl - Fnl_sep)), 1e-14, 
+                        'Multiple element forces do not match.')
+        
+        self.assertLess(np.max(np.abs(dFnldU - dFnldU_sep)), 1e-14, 
+                        'Multiple element gradients do not match.')
+        
+        # Check gradient, including the zeroth harmonic slider initialization
+        combined_h0 = JenkinsForce(Q, T, kt, Fs, u0=None)
+        
+        fun = lambda U : combined_h0.aft(U, w, h, Nt=Nt)[0:2]
+        
+        # Finite difference error from the slipping element is larger here
+        grad_failed = vutils.check_grad(fun, U, verbose=False, atol=1e-10)
+        
+        self.assertFalse(grad_failed, 'Incorrect multiple element gradient.')
+        
 
 if __name__ == '__main__':
     unittest.main()
@@ -308,6 +308,57 @@ class TestJAXJenkins(unittest.TestCase):
         
 
 
+    def test_vec_jenk_half_sample(self):
+        """
+        Test single harmonic motion with the peaks between two time samples.
+        The two equal samples at each peak should only count as one velocity
+        reversal.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        ##### Get tolerances from class
+        force_tol = self.tols[0]
+
+        # Slip force below the amplitude so that the peaks are slipping
+        Q = np.array([[1.0]])
+        T = np.array([[1.0]])
+
+        kt = 2.0
+        Fs = 1.0
+
+        ref_jenkins = JenkinsForce(Q, T, kt, Fs, u0=None)
+        jenkins_force = VectorJenkins(Q, T, kt, Fs, u0=None)
+
+        ###### Test Parameters
+        Nt = 1 << 7
+        w = 1.7
+
+        h = np.array([0, 1])
+
+        ##### Verification
+
+        for k in range(20):
+
+            # Phase of half a time step moves the peak between two samples
+            phase = (2*k + 1)*np.pi/Nt
+
+            Unl = 3.0*np.array([[0.0, np.cos(phase), np.sin(phase)]]).T
+
+            FnlH_ref = ref_jenkins.aft(Unl, w, h, Nt=Nt)[0]
+
+            FnlH = jenkins_force.aft(Unl, w, h, Nt=Nt)[0]
+
+            FH_error = np.max(np.abs(FnlH-FnlH_ref))
+
+            self.assertLess(FH_error, force_tol,
+                            'Incorrect vectorized Jenkins AFT forces for '
+                            + 'peaks between time samples.')
+
+
     def test_h0_force_opts(self):
         """
         Test moderate amplitude case
@@ -366,6 +417,33 @@ class TestJAXJenkins(unittest.TestCase):
         self.assertFalse(grad_failed, 'Incorrect Gradient from u0 setting.')
         # Gradients are correct?
         
+    def test_calc_grad_opt(self):
+        """
+        Test that AFT without gradients returns the same force
+        
+        Returns
+        -------
+        None.
+        
+        """
+        
+        h = np.array([0, 1, 2, 3])
+        Unl = 5*np.array([[0.75, 2.0, 1.3, 0.0, 0.0, 1.0, 0.0]]).T
+        
+        w = 1.7
+        Nt = 1 << 7
+        
+        res_default = self.jenkins_force.aft(Unl, w, h, Nt=Nt)
+        res_no_grad = self.jenkins_force.aft(Unl, w, h, Nt=Nt, calc_grad=False)
+        
+        self.assertEqual(len(res_default), 3, 
+                         'Default AFT returns wrong number of outputs')
+        self.assertEqual(len(res_no_grad), 1, 
+                         'No Grad AFT returns wrong number of outputs')
+        
+        self.assertLess(np.max(np.abs(res_default[0] - res_no_grad[0])), 
+                        1e-15, 'No grad option on AFT is returning wrong force.')
+        
 
 if __name__ == '__main__':
     unittest.main()
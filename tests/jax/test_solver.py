@@ -14,7 +14,7 @@ import numpy as np
 import unittest
 
 sys.path.append('../..')
-from tmdsimpy.jax.solvers import NonlinearSolverOMP
+from tmdsimpy.jax.solvers import NonlinearSolverOMP, _check_convg
 
 sys.path.append('..')
 import verification_utils as vutils
@@ -481,6 +481,33 @@ class TestSolverOMP(unittest.TestCase):
         
         self.assertLess(np.linalg.norm(X_ls - offset/coef), 1e-6,
                     'Line search + BFGS solution does not meet expected tolerance.')
-        
+
+    def test_check_convg_rel(self):
+        """
+        Test that each relative tolerance is checked against the matching
+        relative error.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        tol_dict = {'xtol_rel' : 1e-6, 'rtol_rel' : 1e-6, 'etol_rel' : 1e-6}
+
+        # Arguments are r_curr, e_curr, u_curr, r_rel, e_rel, u_rel
+        errors = {'xtol_rel' : (1.0, 1.0, 1.0, 1.0, 1.0, 1e-8),
+                  'rtol_rel' : (1.0, 1.0, 1.0, 1e-8, 1.0, 1.0),
+                  'etol_rel' : (1.0, 1.0, 1.0, 1.0, 1e-8, 1.0)}
+
+        for key in tol_dict.keys():
+            for err_key in errors.keys():
+
+                converged = _check_convg([key], tol_dict, *errors[err_key])
+
+                self.assertEqual(converged, key == err_key,
+                                 'Tolerance {} did not check the correct '
+                                 'relative error.'.format(key))
+
 if __name__ == '__main__':
     unittest.main()
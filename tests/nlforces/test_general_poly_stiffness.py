@@ -383,7 +383,7 @@ class TestGenPolyAFT(unittest.TestCase):
         h = np.array([0, 1]) # Automate Checking with this
         Nhc = 2*(h !=0).sum() + (h==0).sum() # Number of Harmonic Components 
         
-        U = np.random.rand(Nd*Nhc, 1)
+        U = rng.random((Nd*Nhc, 1))
         
         fun = lambda U: nl_force.aft(U, w, h)[0:2]
 
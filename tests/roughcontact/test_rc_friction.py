@@ -14,6 +14,8 @@ Steps:
 # Standard imports
 import numpy as np
 import sys
+import os
+import subprocess
 import unittest
 
 # Python Utilities
@@ -584,8 +586,237 @@ class TestRoughContact(unittest.TestCase):
                          'No grad option on EPMC is returning wrong residual.')  
         
         self.assertNotEqual(np.linalg.norm(res_default[0]), 0.0,
-                         'Bad test of nonlinear residual, is all zeros.')  
+                         'Bad test of nonlinear residual, is all zeros.')
         
+    def test_batch_elements(self):
+        """
+        Test that a single object with several elements gives the same 
+        results as several objects with one element each.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        self._check_batch_elements(use_pmap=False)
+        
+    def test_batch_elements_use_pmap(self):
+        """
+        Test batch elements with the option to split elements between JAX
+        devices. With a single device, this checks the fallback to vmap.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        self._check_batch_elements(use_pmap=True)
+        
+    def _check_batch_elements(self, use_pmap):
+        """
+        Compare a single object with several elements to several objects
+        with one element each.
+
+        Parameters
+        ----------
+        use_pmap : bool
+            Passed to the batch object to select splitting elements between 
+            JAX devices.
+
+        Returns
+        -------
+        None.
+
+        """
         
+        yaml_file = './reference/element_cycle_tractions.yaml'
+        
+        with open(yaml_file, 'r') as file:
+            ref_dict = yaml.safe_load(file)
+        
+        Nel = 3
+        N = 5
+        
+        rng = np.random.default_rng(seed=1023)
+        
+        Ls_all = rng.standard_normal((Nel, 3, N))
+        Lf_all = rng.standard_normal((Nel, N, 3))
+        meso_gap = np.array([0.0, 0.2e-5, 0.5e-5])
+        
+        params = (ref_dict['E'], ref_dict['nu'], ref_dict['R'], 
+                  ref_dict['Et'], ref_dict['Sys'], ref_dict['mu'])
+        
+        kwargs = {'gaps' : np.array(ref_dict['gap_values']), 
+                  'gap_weights' : np.array(ref_dict['gap_weights'])}
+        
+        batch_model = RoughContactFriction.from_batch(Ls_all, Lf_all, *params,
+                                                      meso_gap=meso_gap, 
+                                                      use_pmap=use_pmap,
+                                                      **kwargs)
+        
+        self.assertEqual(batch_model.Q.shape, (3*Nel, N), 
+                         'Batch model has wrong shape of Q.')
+        
+        self.assertEqual(batch_model.T.shape, (N, 3*Nel), 
+                         'Batch model has wrong shape of T.')
+        
+        single_models = [RoughContactFriction(Ls_all[i], Lf_all[i], *params, 
+                                              meso_gap=meso_gap[i], **kwargs)
+                         for i in range(Nel)]
+        
+        ###############
+        # Static Forces and History
+        
+        X_list = [1e-5*rng.standard_normal(N) + 2e-5*np.linalg.pinv(
+                                                batch_model.Q)[:, 2::3].sum(1)
+                  for i in range(3)]
+        
+        for X in X_list:
+            
+            F_batch, dFdX_batch = batch_model.force(X, update_hist=True)
+            
+            F_single = np.zeros(N)
+            dFdX_single = np.zeros((N, N))
+            
+            for model in single_models:
+                F_curr, dFdX_curr = model.force(X, update_hist=True)
+                
+                F_single += F_curr
+                dFdX_single += dFdX_curr
+                
+            self.assertLess(np.abs(F_batch - F_single).max(), 
+                            1e-12*np.abs(F_single).max(), 
+                            'Batch static force does not match single elements.')
+            
+            self.assertLess(np.abs(dFdX_batch - dFdX_single).max(), 
+                            1e-12*np.abs(dFdX_single).max(), 
+                            'Batch static gradient does not match single elements.')
+        
+        ###############
+        # AFT
+        
+        X0 = X_list[-1]
+        
+        batch_model.set_aft_initialize(X0)
+        for model in single_models:
+            model.set_aft_initialize(X0)
+        
+        w = 1.35
+        h = np.array(range(3+1))
+        Nhc = hutils.Nhc(h)
+        
+        U = np.zeros(N*Nhc)
+        U[:N] = X0
+        U[N:] = 0.2e-5*rng.standard_normal(N*(Nhc-1))
+        
+        aft_batch = batch_model.aft(U, w, h, Nt=1<<7)
+        
+        aft_single = [np.zeros(N*Nhc), np.zeros((N*Nhc, N*Nhc)), 
+                      np.zeros(N*Nhc)]
+        
+        for model in single_models:
+            aft_curr = model.aft(U, w, h, Nt=1<<7)
+            
+            for ind in range(3):
+                aft_single[ind] += aft_curr[ind]
+                
+        for ind in range(2):
+            self.assertLess(np.abs(aft_batch[ind] - aft_single[ind]).max(), 
+                            1e-12*np.abs(aft_single[ind]).max(), 
+                            'Batch AFT does not match single elements, '
+                            + 'output {}.'.format(ind))
+            
+        self.assertLess(np.abs(aft_batch[2] - aft_single[2]).max(), 1e-12, 
+                        'Batch AFT gradient w.r.t. w does not match.')
+        
+        # No gradient option matches
+        Fnl_no_grad = batch_model.aft(U, w, h, Nt=1<<7, calc_grad=False)[0]
+        
+        self.assertLess(np.abs(Fnl_no_grad - aft_batch[0]).max(), 
+                        1e-12*np.abs(aft_batch[0]).max(), 
+                        'Batch AFT without gradient does not match.')
+
+    def test_batch_elements_pmap(self):
+        """
+        Test that the batch elements comparisons also pass when there are
+        several JAX devices, with and without splitting the elements between
+        them with pmap.
+        
+        JAX only creates several CPU devices if XLA_FLAGS is set before it 
+        is imported, so `test_batch_elements` and 
+        `test_batch_elements_use_pmap` are run in a subprocess. 
+        The 3 elements do not divide evenly between the 2 devices, so the 
+        padding of the elements is also checked.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        env = dict(os.environ)
+        env['XLA_FLAGS'] = '--xla_force_host_platform_device_count=2'
+        
+        code = ('import sys, unittest, jax\n'
+                'assert jax.local_device_count() == 2, '
+                    '"Expected 2 JAX devices."\n'
+                'suite = unittest.defaultTestLoader.loadTestsFromNames(['
+                    '"test_rc_friction.TestRoughContact.test_batch_elements", '
+                    '"test_rc_friction.TestRoughContact'
+                    '.test_batch_elements_use_pmap"])\n'
+                'result = unittest.TextTestRunner().run(suite)\n'
+                'sys.exit(not result.wasSuccessful())\n')
+        
+        out = subprocess.run([sys.executable, '-c', code], env=env, 
+                             cwd=os.path.dirname(os.path.abspath(__file__)),
+                             capture_output=True, text=True)
+        
+        self.assertEqual(out.returncode, 0, 
+                         'Batch elements with pmap over 2 devices failed:\n'
+                         + out.stdout + out.stderr)
+
+    def test_array_material_props(self):
+        """
+        Test that material properties given as 0-d arrays can be used as
+        static arguments and give the same forces as floats.
+
+        Returns
+        -------
+        None.
+
+        """
+
+        yaml_file = './reference/element_cycle_tractions.yaml'
+
+        with open(yaml_file, 'r') as file:
+            ref_dict = yaml.safe_load(file)
+
+        params = [float(ref_dict[key]) for key in ['E', 'nu', 'R', 'Et',
+                                                   'Sys', 'mu']]
+
+        kwargs = {'gaps' : np.array(ref_dict['gap_values']),
+                  'gap_weights' : np.array(ref_dict['gap_weights'])}
+
+        float_model = RoughContactFriction(np.eye(3), np.eye(3), *params,
+                                           **kwargs)
+
+        array_model = RoughContactFriction(np.eye(3), np.eye(3),
+                                           *[np.array(p) for p in params],
+                                           **kwargs)
+
+        X = np.array([1e-6, -0.5e-6, 2e-5])
+
+        F_float, dFdX_float = float_model.force(X)
+        F_array, dFdX_array = array_model.force(X)
+
+        self.assertEqual(np.abs(F_array - F_float).max(), 0.0,
+                         'Array material properties change static force.')
+
+        self.assertEqual(np.abs(dFdX_array - dFdX_float).max(), 0.0,
+                         'Array material properties change static gradient.')
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -447,6 +447,312 @@ class TestContinuation(unittest.TestCase):
                         'Unexpectedly high error between FRF and continuation.')
 
 
+    def test_predict_reuse(self):
+        """
+        Test that repeated predictions at the same point (e.g., for retries 
+        with FracLamList) reuse the null space without re-evaluating the 
+        residual and match a fresh prediction.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        Uw0,solver,CtoP,fun,lam0,lam1,vib_sys,Fl = self.linear_sys_data
+        
+        nfev = [0]
+        
+        def counted_fun(Uw):
+            nfev[0] += 1
+            return fun(Uw)
+        
+        XlamPprev = np.copy(Uw0)
+        XlamPprev[-1] = XlamPprev[-1] - 1
+        
+        cont_solver = Continuation(solver, CtoP=CtoP, 
+                                   config={'FracLam' : 0.5, 'verbose' : -1})
+        
+        dirC = cont_solver.predict(counted_fun, Uw0, XlamPprev, Uw0-XlamPprev)
+        
+        cont_solver.config['FracLam'] = 0.9
+        dirC_reuse = cont_solver.predict(counted_fun, Uw0, XlamPprev, dirC)
+        
+        self.assertEqual(nfev[0], 1, 
+                         'Residual should only be evaluated once at a point.')
+        
+        # Fresh prediction with the second FracLam value
+        ref_solver = Continuation(solver, CtoP=CtoP, 
+                                  config={'FracLam' : 0.9, 'verbose' : -1})
+        
+        dirC_ref = ref_solver.predict(fun, Uw0, XlamPprev, dirC)
+        
+        self.assertLess(np.abs(dirC_reuse - dirC_ref).max(), 
+                        1e-10*np.abs(dirC_ref).max(), 
+                        'Reused prediction does not match fresh prediction.')
+        
+        # A new point requires a new residual evaluation
+        Uw1 = Uw0 + 1e-3*dirC_ref*CtoP
+        cont_solver.predict(counted_fun, Uw1, Uw0, dirC_reuse)
+        
+        self.assertEqual(nfev[0], 2, 
+                         'Residual should be evaluated at a new point.')
+
+    def test_predict_tol(self):
+        """
+        Test that predictions are accepted without calling the nonlinear 
+        solver when the residual at the prediction is below `predict_tol`.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        Uw0,solver,CtoP,fun,lam0,lam1,vib_sys,Fl = self.linear_sys_data
+        
+        fun_grad_opt = lambda Uw, calc_grad=True : \
+                            vib_sys.hbm_res(Uw, Fl, self.continuation_data[2], 
+                                            calc_grad=calc_grad)
+        
+        # Count calls to the nonlinear solver on a separate solver object
+        count_solver = NonlinearSolver()
+        nsolve_calls = [0]
+        
+        def counted_nsolve(*args, **kwargs):
+            nsolve_calls[0] += 1
+            return NonlinearSolver.nsolve(count_solver, *args, **kwargs)
+        
+        count_solver.nsolve = counted_nsolve
+        
+        MaxSteps = 5
+        
+        continue_config = {'MaxSteps'    : MaxSteps,
+                           'verbose'     : -1,
+                           'predict_tol' : np.inf}
+        
+        cont_solver = Continuation(count_solver, ds0=0.05, CtoP=CtoP, 
+                                   config=continue_config)
+        
+        XlamP_full = cont_solver.continuation(fun_grad_opt, Uw0, lam0, lam1)
+        
+        self.assertEqual(XlamP_full.shape[0], MaxSteps, 
+                         'Accepted predictions should still take steps.')
+        
+        self.assertEqual(nsolve_calls[0], 1, 
+                         'Only the initial point should call the solver.')
+        
+        self.assertTrue((np.diff(XlamP_full[:, -1]) > 0).all(), 
+                        'Accepted predictions should continue forward.')
+        
+        # With a strict tolerance, the corrector is always called
+        nsolve_calls[0] = 0
+        cont_solver = Continuation(count_solver, ds0=0.05, CtoP=CtoP, 
+                                   config={'MaxSteps'    : MaxSteps,
+                                           'verbose'     : -1,
+                                           'predict_tol' : 0.0})
+        
+        cont_solver.continuation(fun_grad_opt, Uw0, lam0, lam1)
+        
+        self.assertEqual(nsolve_calls[0], MaxSteps, 
+                         'Every step should call the solver for predict_tol=0.')
+
+    def test_intermediate_xtol(self):
+        """
+        Test continuation with a looser tolerance for intermediate steps 
+        still resolves the final point to the full tolerance.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        # Unpack data shared between all tests
+        Uw, Fl, h, solver, vib_sys = self.continuation_data
+        
+        Ndof = vib_sys.M.shape[0]
+        
+        # Nonlinear solution at the starting point
+        fun = lambda U : vib_sys.hbm_res(np.hstack((U, Uw[-1])), Fl, h)[0:2]
+        
+        X, R, dRdX, sol = solver.nsolve(fun, Uw[:-1], verbose=False)
+        
+        Uw0 = np.hstack((X, Uw[-1]))
+        
+        CtoP = hutils.harmonic_wise_conditioning(Uw0, Ndof, h, delta=1e-3)
+        
+        fun = lambda Uw : vib_sys.hbm_res(Uw, Fl, h)
+        
+        lam0 = Uw0[-1]
+        lam1 = 1.02*Uw0[-1]
+        
+        continue_config = {'verbose'  : -1,
+                           'xtol'     : 1e-10*Uw0.shape[0], 
+                           'intermediate_xtol_factor' : 1e4}
+        
+        cont_solver = Continuation(solver, ds0=0.05, CtoP=CtoP, 
+                                   config=continue_config)
+        
+        XlamP_full = cont_solver.continuation(fun, Uw0, lam0, lam1)
+        
+        self.assertGreaterEqual(XlamP_full[-1, -1], lam1, 
+                                'Continuation did not reach the final value.')
+        
+        Rnorm = np.array([np.linalg.norm(fun(XlamP)[0]) 
+                          for XlamP in XlamP_full])
+        
+        self.assertGreater(Rnorm[1:-1].max(), 1e-8, 
+                  'Intermediate points should use the looser tolerance.')
+        
+        self.assertLess(Rnorm[-1], 1e-10, 
+                        'Final point should be solved to the full tolerance.')
+        
+    def test_max_dlam(self):
+        """
+        Test that the step size is reduced so that predictions do not exceed
+        the maximum change in lam.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        Uw0,solver,CtoP,fun,lam0,lam1,vib_sys,Fl = self.linear_sys_data
+        
+        # Stop before the first resonance so only a few steps are needed
+        lam1 = 0.5
+        max_dlam = 0.01
+        
+        dlam = []
+        
+        for config_dlam in [np.inf, max_dlam]:
+            continue_config = {'verbose'  : -1,
+                               'dsmin'    : 1e-4,
+                               'max_dlam' : config_dlam}
+            
+            cont_solver = Continuation(solver, ds0=0.05, CtoP=CtoP, 
+                                       config=continue_config)
+            
+            XlamP_full = cont_solver.continuation(fun, Uw0, lam0, lam1)
+            
+            dlam += [np.diff(XlamP_full[:, -1]).max()]
+        
+        self.assertGreater(dlam[0], 2*max_dlam, 
+                           'Reference should take steps larger than max_dlam.')
+        
+        # Corrector may slightly change lam from the prediction
+        self.assertLess(dlam[1], 1.05*max_dlam, 
+                        'Steps should be limited by max_dlam.')
+
+    def test_history_growth(self):
+        """
+        Test that the solution history grows past its initial allocation and
+        is limited to MaxSteps.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        Uw0,solver,CtoP,fun,lam0,lam1,vib_sys,Fl = self.linear_sys_data
+        
+        # Small steps so that more than the initially allocated rows are 
+        # needed
+        lam1 = 0.5
+        
+        for MaxSteps in [300, 1000]:
+            continue_config = {'verbose'  : -1,
+                               'dsmax'    : 0.001,
+                               'MaxSteps' : MaxSteps}
+            
+            cont_solver = Continuation(solver, ds0=0.001, CtoP=CtoP, 
+                                       config=continue_config)
+            
+            XlamP_full = cont_solver.continuation(fun, Uw0, lam0, lam1)
+            
+            self.assertGreater(XlamP_full.shape[0], 256, 
+                               'Test should need more than 256 steps.')
+            
+            self.assertLessEqual(XlamP_full.shape[0], MaxSteps, 
+                                 'History should not exceed MaxSteps.')
+            
+            self.assertTrue((np.diff(XlamP_full[:, -1]) > 0).all(), 
+                            'All stored steps should be solved points.')
+            
+            self.assertEqual(XlamP_full[-1, -1] >= lam1, MaxSteps == 1000,
+                             'Only the longer run should reach lam1.')
+            
+            # Check that older steps remain solutions after growing
+            R = fun(XlamP_full[100])[0]
+            
+            self.assertLess(np.linalg.norm(R), 1e-6, 
+                            'Stored history should not be overwritten.')
+        
+    def test_history_dtype(self):
+        """
+        Test that the solution history can be stored at reduced precision 
+        without changing the solved points.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        Uw0,solver,CtoP,fun,lam0,lam1,vib_sys,Fl = self.linear_sys_data
+        
+        lam1 = 0.5
+        
+        XlamP_full = []
+        
+        for history_dtype in [np.float64, np.float32]:
+            continue_config = {'verbose'  : -1,
+                               'history_dtype' : history_dtype}
+            
+            cont_solver = Continuation(solver, ds0=0.05, CtoP=CtoP, 
+                                       config=continue_config)
+            
+            XlamP_full += [cont_solver.continuation(fun, Uw0, lam0, lam1)]
+            
+            self.assertEqual(XlamP_full[-1].dtype, history_dtype, 
+                             'History should use history_dtype.')
+            
+        self.assertEqual(XlamP_full[0].shape, XlamP_full[1].shape, 
+                         'Reduced precision changed the number of steps.')
+        
+        # Only rounding of the stored values should differ
+        error = np.abs(XlamP_full[1] - XlamP_full[0]).max()
+        
+        self.assertLess(error, 1e-6*np.abs(XlamP_full[0]).max(), 
+                        'Reduced precision history changed the solution.')
+        
+    def test_frac_lam_list_config(self):
+        """
+        Test that creating Continuation objects does not modify the 
+        FracLamList passed in config.
+
+        Returns
+        -------
+        None.
+
+        """
+        
+        solver = self.continuation_data[3]
+        
+        config = {'FracLam' : 0.5, 'FracLamList' : [1.0, 0.0]}
+        
+        for i in range(3):
+            cont_solver = Continuation(solver, config=config)
+        
+        self.assertEqual(config['FracLamList'], [1.0, 0.0], 
+                         'Input FracLamList should not be modified.')
+        
+        self.assertEqual(cont_solver.config['FracLamList'], [0.5, 1.0, 0.0], 
+                         'FracLam should be the first value tried.')
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -11,6 +11,7 @@ Notes:
 """ 
 
 import sys
+import functools
 import numpy as np
 import unittest
 
@@ -22,6 +23,145 @@ import tmdsimpy.utils.harmonic as hutils
 from scipy import io as sio
 
 
+# Inputs and expected outputs for test_harmonic_conditioning. 
+# harmonic_wise_conditioning does not modify its inputs, so these are shared.
+
+# Make something that looks like EPMC Solution
+_UWXA = np.array([0.01, 0.02, 0.1,   0.0001, # harmonic 0
+                  1.0,   5.0, 3.0,   2.0, # harmonic 1 cos
+                  0.02,  0.05, 0.03, 0.02, # Harmonic 1 sine
+                  0.1,   0.2,  0.3,  0.2, # harmonic 3 cos
+                  0.0001, 0.0002, 0.00003, 0.00001, # harmonic 3 sine
+                  1000.0, 1e-6, -4], dtype=np.float64) # w, x, a
+
+_VEC_DELTA = np.array([1e-3, 2.0, 0.5, 0.0], dtype=np.float64)
+
+_CTOP_SCALAR = np.array([3.252500e-02, 3.252500e-02, 3.252500e-02, 3.252500e-02,
+                         1.390000e+00, 1.390000e+00, 1.390000e+00, 1.390000e+00,
+                         1.390000e+00, 1.390000e+00, 1.390000e+00, 1.390000e+00,
+                         1.000425e-01, 1.000425e-01, 1.000425e-01, 1.000425e-01,
+                         1.000425e-01, 1.000425e-01, 1.000425e-01, 1.000425e-01,
+                         1.000000e+03, 1.000000e-04, 4.000000e+00])
+
+_CTOP_VEC = np.array([3.2525e-02, 3.2525e-02, 3.2525e-02, 3.2525e-02, 2.0000e+00,
+                      2.0000e+00, 2.0000e+00, 2.0000e+00, 2.0000e+00, 2.0000e+00,
+                      2.0000e+00, 2.0000e+00, 5.0000e-01, 5.0000e-01, 5.0000e-01,
+                      5.0000e-01, 5.0000e-01, 5.0000e-01, 5.0000e-01, 5.0000e-01,
+                      1.0000e+03, 1.0000e-06, 4.0000e+00])
+
+
+# Failure messages for each derivative order checked in verify_hutils
+_XT_MSGS = tuple('Time series for derivative order {} are incorrect.'.format(order) 
+                 for order in range(4))
+
+_V_MSGS = tuple('Fourier coefficients for derivative order {} are incorrect.'.format(order) 
+                for order in range(4))
+
+
+# Only variables from the .mat files that are used in verify_hutils
+_MAT_VARS = ('M', 'C', 'K', 'h', 'X0', 'w', 'E', 'dEdw', 
+             'x_t0', 'x_t1', 'x_t2', 'x_t3', 'v0', 'v1', 'v2', 'v3')
+
+
+@functools.lru_cache(maxsize=None)
+def _load_mat(fname):
+    """
+    Load and extract the reference values from a MATLAB file.
+    
+    Results are cached so that each file is only read from disk once.
+
+    Parameters
+    ----------
+    fname : str
+        Filename of the .mat file.
+
+    Returns
+    -------
+    mat_sol : dict
+        Extracted values from the .mat file.
+
+    """
+    
+    mat_dict = sio.loadmat(fname, variable_names=_MAT_VARS)
+    
+    mat_sol = {'M' : mat_dict['M'], 
+               'C' : mat_dict['C'], 
+               'K' : mat_dict['K'], 
+               'h' : mat_dict['h'].reshape(-1), 
+               'X0' : mat_dict['X0'], 
+               'w' : mat_dict['w'][0, 0], 
+               'Nt' : mat_dict['x_t0'].shape[0], 
+               'E' : mat_dict['E'], 
+               'dEdw' : mat_dict['dEdw'], 
+               'x_t' : [mat_dict['x_t'+str(order)] for order in range(4)], 
+               'v' : [mat_dict['v'+str(order)] for order in range(4)]}
+    
+    return mat_sol
+
+
+def _assert_small(test_obj, diff, tol, msg=None):
+    """
+    Check that `np.linalg.norm(diff) < tol`.
+    
+    Squared norms are compared to avoid the square root.
+    """
+    
+    diff = np.ravel(diff)
+    
+    test_obj.assertLess(diff @ diff, tol**2, msg)
+    
+
+def _assert_rel_small(test_obj, diff, ref, rtol, msg=None):
+    """
+    Check that `np.linalg.norm(diff) / np.linalg.norm(ref) < rtol`.
+    
+    Squared norms are compared to avoid the square roots and division.
+    """
+    
+    diff = np.ravel(diff)
+    ref = np.ravel(ref)
+    
+    test_obj.assertLess(diff @ diff, (rtol**2) * (ref @ ref), msg)
+    
+    
+def _assert_regions_small(test_obj, named_diffs, tol):
+    """
+    Check that the combined norm of several differences is less than `tol`.
+    
+    Parameters
+    ----------
+    test_obj : unittest class object that is being used and can raise 
+                exceptions if the test fails.
+    named_diffs : list of tuple
+        Each entry is `(msg, diff)` with a description of the region and the
+        difference for that region that should be zero.
+    tol : float
+        Tolerance on the norm of all differences together.
+
+    Notes
+    -----
+    All differences are checked with a single reduction. On failure, the 
+    message is that of the region with the largest error.
+    """
+    
+    msgs, diffs = zip(*named_diffs)
+    diffs = [np.ravel(diff) for diff in diffs]
+    
+    all_diff = np.concatenate(diffs)
+    
+    sq_norm = all_diff @ all_diff
+    
+    if not sq_norm < tol**2:
+        # Squared error for each region to identify the failures
+        starts = np.cumsum([0] + [diff.shape[0] for diff in diffs[:-1]])
+        region_sq = np.add.reduceat(all_diff**2, starts)
+        
+        worst = np.argmax(region_sq)
+        
+        test_obj.fail('{} (error norm {:.3e} >= {:.3e})'.format(
+                        msgs[worst], np.sqrt(sq_norm), tol))
+
+
 def verify_hutils(fname, test_obj, tol=1e-12):
     """
     Function that can be repeatedly called to run tests of the harmonic 
@@ -45,46 +185,47 @@ def verify_hutils(fname, test_obj, tol=1e-12):
     """
     
     
-    mat_sol = sio.loadmat(fname)
+    mat_sol = _load_mat(fname)
     M = mat_sol['M']
     C = mat_sol['C']
     K = mat_sol['K']
     
-    h = mat_sol['h'].reshape(-1)
-    # nd = mat_sol['nd'][0, 0]
+    h = mat_sol['h']
     X0 = mat_sol['X0']
     
-    w = mat_sol['w'][0, 0]
+    w = mat_sol['w']
     
-    Nt = mat_sol['x_t0'].shape[0]
+    Nt = mat_sol['Nt']
     
     ####### Compare Values
     
     E, dEdw = hutils.harmonic_stiffness(M, C, K, w, h)
     
-    test_obj.assertLess(np.linalg.norm(E - mat_sol['E']), tol, 
-                        'Harmonic stiffness is incorrect.')
+    _assert_small(test_obj, E - mat_sol['E'], tol, 
+                  'Harmonic stiffness is incorrect.')
     
-    test_obj.assertLess(np.linalg.norm(dEdw - mat_sol['dEdw']), tol, 
-                        'Harmonic stiffness freq. gradient is incorrect.')
+    _assert_small(test_obj, dEdw - mat_sol['dEdw'], tol, 
+                  'Harmonic stiffness freq. gradient is incorrect.')
     
     # Verifying GETFOURIERCOEFF / GETFOURIERCOEFF, 
     # looping over derivative order
-    for order in range(0, 4):
-        
-        x_t = hutils.time_series_deriv(Nt, h, X0, order)
-        
-        error = np.max(np.abs(x_t - mat_sol['x_t'+str(order)]))
+    orders = range(0, 4)
+    
+    x_t_all = [hutils.time_series_deriv(Nt, h, X0, order) for order in orders]
+    
+    # All orders are transformed back together in a single FFT call
+    v_all = np.split(hutils.get_fourier_coeff(h, np.hstack(x_t_all)), 
+                     len(orders), axis=1)
+    
+    for order, x_t, v in zip(orders, x_t_all, v_all):
         
-        test_obj.assertLess(error, tol, 
-                'Time series for derivative order {} are incorrect.'.format(order))
+        error = np.max(np.abs(x_t - mat_sol['x_t'][order]))
         
-        v = hutils.get_fourier_coeff(h, x_t)
+        test_obj.assertLess(error, tol, _XT_MSGS[order])
         
-        error = np.max(np.abs(v - mat_sol['v'+str(order)]))
+        error = np.max(np.abs(v - mat_sol['v'][order]))
         
-        test_obj.assertLess(error, tol, 
-                'Fourier coefficients for derivative order {} are incorrect.'.format(order))
+        test_obj.assertLess(error, tol, _V_MSGS[order])
         
     return
 
@@ -117,6 +258,87 @@ class TestHarmonicUtils(unittest.TestCase):
         
         verify_hutils(fname, self)
         
+    def _check_stiffness_opts(self, M, C, K, w, h):
+        """
+        Check the options of harmonic stiffness for a single set of 
+        matrices and harmonics against the default options.
+        """
+        
+        E_rtol = 1e-12
+        dEdw_rtol = 1e-12
+        
+        ###############
+        # Verify the option to not calculate the gradient + verify default
+        ref = hutils.harmonic_stiffness(M, C, K, w, h)
+        
+        yes_grad = hutils.harmonic_stiffness(M, C, K, w, h, 
+                                             calc_grad=True)
+        
+        no_grad = hutils.harmonic_stiffness(M, C, K, w, h, 
+                                            calc_grad=False)
+        
+        self.assertEqual(len(ref), len(yes_grad), 
+                 'Default does not return correct number of arguments')
+        
+        self.assertEqual(len(no_grad), 1)
+        
+        _assert_rel_small(self, yes_grad[0] - ref[0], ref[0], 
+                          E_rtol)
+        
+        _assert_rel_small(self, yes_grad[1] - ref[1], ref[1], 
+                          E_rtol)
+            
+        _assert_rel_small(self, no_grad[0] - ref[0], ref[0], 
+                          dEdw_rtol)
+            
+        ###############
+        # Verify the EPMC option of only calculating effects of C
+        
+        # Zero mass and stiffness matrices
+        Z = np.zeros_like(M)
+        
+        ref_c = hutils.harmonic_stiffness(Z, C, Z, w, h)
+        
+        all_mats = hutils.harmonic_stiffness(Z, C, Z, w, h, 
+                                             only_C=False)
+        
+        # Pass arbitrary arguments for M and K to verify that they
+        # don't influence anything
+        # EPMC also does not need the frequency gradient of this
+        only_c = hutils.harmonic_stiffness(1.5, C, 
+                                           np.array([1.0, 2.0]), 
+                                           w, h, only_C=True,
+                                           calc_grad=False)
+        
+        _assert_rel_small(self, all_mats[0] - ref_c[0], ref_c[0], 
+                          E_rtol)
+        
+        _assert_rel_small(self, all_mats[1] - ref_c[1], ref_c[1], 
+                          E_rtol)
+            
+        _assert_rel_small(self, only_c[0] - ref_c[0], ref_c[0], 
+                          dEdw_rtol)
+        
+        ###############
+        # Verify the block sparse output
+        sparse = hutils.harmonic_stiffness(M, C, K, w, h, sparse=True)
+        
+        _assert_rel_small(self, sparse[0].toarray() - ref[0], ref[0], 
+                          E_rtol)
+        
+        _assert_rel_small(self, sparse[1].toarray() - ref[1], ref[1], 
+                          dEdw_rtol)
+        
+        sparse_c = hutils.harmonic_stiffness(1.5, C, 
+                                             np.array([1.0, 2.0]), 
+                                             w, h, only_C=True,
+                                             calc_grad=False, sparse=True)
+        
+        self.assertEqual(len(sparse_c), 1)
+        
+        _assert_rel_small(self, sparse_c[0].toarray() - ref_c[0], ref_c[0], 
+                          E_rtol)
+        
     def test_harmonic_stiffness_opts(self):
         """
         Test options on harmonic stiffness to verify that they still give 
@@ -128,72 +350,25 @@ class TestHarmonicUtils(unittest.TestCase):
         
         w = 1.393
         
-        E_rtol = 1e-12
-        dEdw_rtol = 1e-12
+        # Matrices only depend on Ndof (same seed for every case), so generate
+        # them once for each size
+        mats = {}
+        for Ndof in [1, 15]:
+            
+            rng = np.random.default_rng(seed=1023)
+            
+            # Single draw gives the same M, C, K as three sequential draws
+            M, C, K = rng.random((3, Ndof, Ndof))
+            
+            mats[Ndof] = (M, C, K)
         
         for h in h_sets:
             
-            for Ndof in [1, 15]:
-            
-                rng = np.random.default_rng(seed=1023)
-                
-                M = rng.random((Ndof, Ndof))
-                C = rng.random((Ndof, Ndof))
-                K = rng.random((Ndof, Ndof))
-                
-                ###############
-                # Verify the option to not calculate the gradient + verify default
-                ref = hutils.harmonic_stiffness(M, C, K, w, h)
-                
-                yes_grad = hutils.harmonic_stiffness(M, C, K, w, h, 
-                                                    calc_grad=True)
-                
-                no_grad = hutils.harmonic_stiffness(M, C, K, w, h, 
-                                                    calc_grad=False)
-                
-                self.assertEqual(len(ref), len(yes_grad), 
-                         'Default does not return correct number of arguments')
+            for Ndof in mats.keys():
                 
-                self.assertEqual(len(no_grad), 1)
-                
-                self.assertLess(np.linalg.norm(yes_grad[0] - ref[0]) \
-                                / np.linalg.norm(ref[0]), 
-                                E_rtol)
-                
-                self.assertLess(np.linalg.norm(yes_grad[1] - ref[1]) \
-                                / np.linalg.norm(ref[1]), 
-                                E_rtol)
+                with self.subTest(h=tuple(h.tolist()), Ndof=Ndof):
                     
-                self.assertLess(np.linalg.norm(no_grad[0] - ref[0]) \
-                                / np.linalg.norm(ref[0]), 
-                                dEdw_rtol)
-                    
-                ###############
-                # Verify the EPMC option of only calculating effects of C
-                ref_c = hutils.harmonic_stiffness(0.0*M, C, 0.0*K, w, h)
-                
-                all_mats = hutils.harmonic_stiffness(0.0*M, C, 0.0*K, w, h, 
-                                                    only_C=False)
-                
-                # Pass arbitrary arguments for M and K to verify that they
-                # don't influence anything
-                # EPMC also does not need the frequency gradient of this
-                only_c = hutils.harmonic_stiffness(1.5, C, 
-                                                   np.array([1.0, 2.0]), 
-                                                   w, h, only_C=True,
-                                                   calc_grad=False)
-                
-                self.assertLess(np.linalg.norm(all_mats[0] - ref_c[0]) \
-                                / np.linalg.norm(ref_c[0]), 
-                                E_rtol)
-                
-                self.assertLess(np.linalg.norm(all_mats[1] - ref_c[1]) \
-                                / np.linalg.norm(ref_c[1]), 
-                                E_rtol)
-                    
-                self.assertLess(np.linalg.norm(only_c[0] - ref_c[0]) \
-                                / np.linalg.norm(ref_c[0]), 
-                                dEdw_rtol)
+                    self._check_stiffness_opts(*mats[Ndof], w, h)
                     
     def test_harmonic_conditioning(self):
         """
@@ -204,32 +379,14 @@ class TestHarmonicUtils(unittest.TestCase):
         
         Ndof = 4
         
-        # Make something that looks like EPMC Solution
-        Uwxa = np.array([0.01, 0.02, 0.1,   0.0001, # harmonic 0
-                         1.0,   5.0, 3.0,   2.0, # harmonic 1 cos
-                         0.02,  0.05, 0.03, 0.02, # Harmonic 1 sine
-                         0.1,   0.2,  0.3,  0.2, # harmonic 3 cos
-                         0.0001, 0.0002, 0.00003, 0.00001, # harmonic 3 sine
-                         1000.0, 1e-6, -4]) # w, x, a
-        
+        Uwxa = _UWXA
         
         scalar_delta = 1e-4
-        CtoP_expected_scalar_delta = \
-            np.array([3.252500e-02, 3.252500e-02, 3.252500e-02, 3.252500e-02,
-                   1.390000e+00, 1.390000e+00, 1.390000e+00, 1.390000e+00,
-                   1.390000e+00, 1.390000e+00, 1.390000e+00, 1.390000e+00,
-                   1.000425e-01, 1.000425e-01, 1.000425e-01, 1.000425e-01,
-                   1.000425e-01, 1.000425e-01, 1.000425e-01, 1.000425e-01,
-                   1.000000e+03, 1.000000e-04, 4.000000e+00])
-            
-        vec_delta = [1e-3, 2.0, 0.5, 0.0]
+        CtoP_expected_scalar_delta = _CTOP_SCALAR
+        
+        vec_delta = _VEC_DELTA
         
-        CtoP_expected_vec_delta = \
-            np.array([3.2525e-02, 3.2525e-02, 3.2525e-02, 3.2525e-02, 2.0000e+00,
-                   2.0000e+00, 2.0000e+00, 2.0000e+00, 2.0000e+00, 2.0000e+00,
-                   2.0000e+00, 2.0000e+00, 5.0000e-01, 5.0000e-01, 5.0000e-01,
-                   5.0000e-01, 5.0000e-01, 5.0000e-01, 5.0000e-01, 5.0000e-01,
-                   1.0000e+03, 1.0000e-06, 4.0000e+00])
+        CtoP_expected_vec_delta = _CTOP_VEC
         
         ##############
         # Baseline case where delta is constant
@@ -248,8 +405,9 @@ class TestHarmonicUtils(unittest.TestCase):
                         1e-8)
             
         ##############
-        # Verify No Error for No Extra Terms
-        CtoP = hutils.harmonic_wise_conditioning(Uwxa[:-3], Ndof, h, delta=vec_delta[:-1])
+        # Verify No Error for No Extra Terms (and that a list delta works)
+        CtoP = hutils.harmonic_wise_conditioning(Uwxa[:-3], Ndof, h, 
+                                                 delta=vec_delta[:-1].tolist())
         
         self.assertLess(np.max(np.abs(CtoP_expected_vec_delta[:-3] - CtoP) \
                                / CtoP_expected_vec_delta[:-3]), 
@@ -270,60 +428,53 @@ class TestHarmonicUtils(unittest.TestCase):
         Ndof = 3
         Nhc = hutils.Nhc(h)
         
+        # Columns of each set of harmonic components
+        s0 = slice(0, Ndof) # zeroth harmonic
+        s1 = slice(Ndof, 3*Ndof) # first harmonic
+        s1c = slice(Ndof, 2*Ndof) # first harmonic cosine
+        s1s = slice(2*Ndof, 3*Ndof) # first harmonic sine
+        s2 = slice(3*Ndof, 5*Ndof) # second harmonic
+        sx = slice(Ndof*Nhc, None) # extra columns
+        
         U_orig = np.array([[0.68, 0.93, 0.29, 0.27, 0.8 , 0.67, 0.69, 0.86, 
                        0.22, 0.99, 0.8 , 0.85, 0.71, 0.17, 0.61, 0.95],
                       [0.35, 0.43, 0.27, 0.8 , 0.1 , 0.98, 0.34, 0.62, 
                        0.94, 0.28, 0.75, 0.54, 0.64, 0.74, 0.45, 0.1 ]])
         
         phase = np.pi
-        U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
-        
-        self.assertLess(np.linalg.norm(U_orig[:, :Ndof] - U_rot[:, :Ndof]), 
-                        equal_tol,
-                        'Zeroth harmonic should not change.')
-        
-        self.assertLess(np.linalg.norm(U_orig[:, Ndof*Nhc:] \
-                                       - U_rot[:, Ndof*Nhc:]), 
-                        equal_tol,
-                        'Extra columns should not change.')
-        
-        self.assertLess(np.linalg.norm(U_orig[:, Ndof:3*Ndof] \
-                                       + U_rot[:, Ndof:3*Ndof]), 
-                        equal_tol,
-                        'First harmonic should change signs.')
-        
-        self.assertLess(np.linalg.norm(U_orig[:, 3*Ndof:5*Ndof] \
-                                       - U_rot[:, 3*Ndof:5*Ndof]), 
-                        equal_tol,
-                        'Second Harmonic should not change.')
+        with self.subTest(h=tuple(h.tolist()), h_rotate=h_rotate, 
+                          phase=phase):
+            U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
+            
+            _assert_regions_small(self, 
+                [('Zeroth harmonic should not change.', 
+                  U_orig[:, s0] - U_rot[:, s0]),
+                 ('Extra columns should not change.', 
+                  U_orig[:, sx] - U_rot[:, sx]),
+                 ('First harmonic should change signs.', 
+                  U_orig[:, s1] + U_rot[:, s1]),
+                 ('Second Harmonic should not change.', 
+                  U_orig[:, s2] - U_rot[:, s2])], 
+                equal_tol)
         
         
         phase = np.pi/2
-        U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
-        
-        self.assertLess(np.linalg.norm(U_orig[:, :Ndof] - U_rot[:, :Ndof]), 
-                        equal_tol,
-                        'Zeroth harmonic should not change.')
-        
-        self.assertLess(np.linalg.norm(U_orig[:, Ndof*Nhc:] \
-                                       - U_rot[:, Ndof*Nhc:]), 
-                        equal_tol,
-                        'Extra columns should not change.')
-        
-        self.assertLess(np.linalg.norm(U_rot[:, Ndof:2*Ndof] \
-                                       + U_orig[:, 2*Ndof:3*Ndof]), 
-                        equal_tol,
-                        'First harmonic should swap sine/cosine.')
-        
-        self.assertLess(np.linalg.norm(U_rot[:, 2*Ndof:3*Ndof] \
-                                       - U_orig[:, Ndof:2*Ndof]), 
-                        equal_tol,
-                        'First harmonic should swap sine/cosine.')
+        with self.subTest(h=tuple(h.tolist()), h_rotate=h_rotate, 
+                          phase=phase):
+            U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
             
-        self.assertLess(np.linalg.norm(U_orig[:, 3*Ndof:5*Ndof] \
-                                       + U_rot[:, 3*Ndof:5*Ndof]), 
-                        equal_tol,
-                        'Second Harmonic should change sign.')
+            _assert_regions_small(self, 
+                [('Zeroth harmonic should not change.', 
+                  U_orig[:, s0] - U_rot[:, s0]),
+                 ('Extra columns should not change.', 
+                  U_orig[:, sx] - U_rot[:, sx]),
+                 ('First harmonic should swap sine/cosine.', 
+                  U_rot[:, s1c] + U_orig[:, s1s]),
+                 ('First harmonic should swap sine/cosine.', 
+                  U_rot[:, s1s] - U_orig[:, s1c]),
+                 ('Second Harmonic should change sign.', 
+                  U_orig[:, s2] + U_rot[:, s2])], 
+                equal_tol)
         
         # Without zeroth harmonic, and applied to second harmonic
         h = np.arange(1, 3)
@@ -332,6 +483,13 @@ class TestHarmonicUtils(unittest.TestCase):
         Ndof = 2
         Nhc = hutils.Nhc(h)
         
+        # Columns of each set of harmonic components
+        s1 = slice(0, 2*Ndof) # first harmonic
+        s1c = slice(0, Ndof) # first harmonic cosine
+        s1s = slice(Ndof, 2*Ndof) # first harmonic sine
+        s2 = slice(2*Ndof, 4*Ndof) # second harmonic
+        sx = slice(Ndof*Nhc, None) # extra columns
+        
         U_orig = np.array([[0.72, 0.95, 0.99, 0.54, 0.67, 0.95, 0.15, 
                             0.58, 0.43, 0.78, 0.94, 0.27, 0.77],
                            [0.03, 0.22, 0.68, 0.63, 0.04, 0.08, 0.47, 
@@ -344,47 +502,110 @@ class TestHarmonicUtils(unittest.TestCase):
         
         # result should act the same as phase=np.pi/2 from above with h_rotate=1
         phase = np.pi
-        U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
-        
-        self.assertLess(np.linalg.norm(U_orig[:, Ndof*Nhc:] \
-                                       - U_rot[:, Ndof*Nhc:]), 
-                        equal_tol,
-                        'Extra columns should not change.')
-        
-        self.assertLess(np.linalg.norm(U_rot[:, :Ndof] \
-                                       + U_orig[:, 1*Ndof:2*Ndof]), 
-                        equal_tol,
-                        'First harmonic should swap sine/cosine.')
-        
-        self.assertLess(np.linalg.norm(U_rot[:, 1*Ndof:2*Ndof] \
-                                       - U_orig[:, :1*Ndof]), 
-                        equal_tol,
-                        'First harmonic should swap sine/cosine.')
+        with self.subTest(h=tuple(h.tolist()), h_rotate=h_rotate, 
+                          phase=phase):
+            U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
             
-        self.assertLess(np.linalg.norm(U_orig[:, 2*Ndof:4*Ndof] \
-                                       + U_rot[:, 2*Ndof:4*Ndof]), 
-                        equal_tol,
-                        'Second Harmonic should change sign.')
+            _assert_regions_small(self, 
+                [('Extra columns should not change.', 
+                  U_orig[:, sx] - U_rot[:, sx]),
+                 ('First harmonic should swap sine/cosine.', 
+                  U_rot[:, s1c] + U_orig[:, s1s]),
+                 ('First harmonic should swap sine/cosine.', 
+                  U_rot[:, s1s] - U_orig[:, s1c]),
+                 ('Second Harmonic should change sign.', 
+                  U_orig[:, s2] + U_rot[:, s2])], 
+                equal_tol)
         
         # result should act the same as phase=np.pi from above with h_rotate=1
         phase = 2*np.pi
-        U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
+        with self.subTest(h=tuple(h.tolist()), h_rotate=h_rotate, 
+                          phase=phase):
+            U_rot = hutils.rotate_subtract_phase(U_orig, Ndof, h, phase, h_rotate)
+            
+            _assert_regions_small(self, 
+                [('Extra columns should not change.', 
+                  U_orig[:, sx] - U_rot[:, sx]),
+                 ('First harmonic should change signs.', 
+                  U_orig[:, s1] + U_rot[:, s1]),
+                 ('Second Harmonic should not change.', 
+                  U_orig[:, s2] - U_rot[:, s2])], 
+                equal_tol)
+        
+    def test_zero_crossing(self):
+        """
+        Test that zero crossings are flagged at the index before the sign 
+        change and that exact zeros are not counted as crossings.
+        """
+        
+        X = np.array([2.0, -1.0, -3.0, 0.0, 4.0, 0.5, -0.25, 1e200, -1e200])
+        
+        TF = hutils.zero_crossing(X)
+        
+        TF_ref = np.array([True, False, False, False, False, True, True, 
+                           True, False])
+        
+        self.assertTrue(np.array_equal(TF, TF_ref), 
+                        'Incorrect zero crossings.')
+        
+        TF = hutils.zero_crossing(X, zero_tol=1.0)
+        
+        TF_ref = np.array([False, False, False, False, False, True, True, 
+                           False, False])
         
-        self.assertLess(np.linalg.norm(U_orig[:, Ndof*Nhc:] \
-                                       - U_rot[:, Ndof*Nhc:]), 
-                        equal_tol,
-                        'Extra columns should not change.')
+        self.assertTrue(np.array_equal(TF, TF_ref), 
+                        'Incorrect zero crossings with tolerance.')
         
-        self.assertLess(np.linalg.norm(U_orig[:, :2*Ndof] \
-                                       + U_rot[:, :2*Ndof]), 
-                        equal_tol,
-                        'First harmonic should change signs.')
+        # Integer inputs should not overflow in the sign test
+        X = np.array([2**62, -2**62, 3], dtype=np.int64)
         
-        self.assertLess(np.linalg.norm(U_orig[:, 2*Ndof:4*Ndof] \
-                                       - U_rot[:, 2*Ndof:4*Ndof]), 
-                        equal_tol,
-                        'Second Harmonic should not change.')
+        TF = hutils.zero_crossing(X)
         
+        self.assertTrue(np.array_equal(TF, [True, True, False]), 
+                        'Integer zero crossings should not overflow.')
+        
+    def test_shift_pm_pi(self):
+        """
+        Test that phases are shifted into [-pi, pi) by multiples of 2*pi.
+        """
+        
+        phase = np.array([0.0, 0.5, -3.0, np.pi, -np.pi, 3*np.pi/2, 
+                          -3*np.pi/2, 7.0, -13.0, 20*np.pi + 0.25])
+        
+        phase_orig = np.copy(phase)
+        
+        shifted = hutils.shift_pm_pi(phase)
+        
+        self.assertTrue(np.array_equal(phase, phase_orig), 
+                        'Input phase should not be modified.')
+        
+        self.assertTrue(np.all(shifted >= -np.pi), 'Phase below -pi.')
+        self.assertTrue(np.all(shifted < np.pi), 'Phase not below pi.')
+        
+        # Difference must be a multiple of 2*pi
+        ncycles = (phase - shifted) / (2*np.pi)
+        
+        _assert_small(self, ncycles - np.round(ncycles), 1e-12, 
+                      'Phase shift is not a multiple of 2*pi.')
+        
+        _assert_small(self, shifted[:3] - phase[:3], 1e-15, 
+                      'Phases in range should not change.')
+
+    def test_nhc_shape_checks(self):
+        """
+        Test that cached Nhc evaluations keep checking the shape of h.
+        """
+
+        self.assertEqual(hutils.Nhc(np.array(range(6))), 11,
+                         'Wrong number of harmonic components.')
+
+        # Same entries as a valid h, but with the wrong shape
+        with self.assertRaises(AssertionError):
+            hutils.Nhc(np.array([[0, 1], [2, 3]]))
+
+        with self.assertRaises(AssertionError):
+            hutils.Nhc(np.array([[1, 2, 3]]))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -114,6 +114,17 @@ class TestSolver(unittest.TestCase):
         self.assertLess(np.linalg.norm(eigvecs - Phi[:, :Ncalc]), 1e-9,
                         'Incorrect eigenvectors.')
         
+        # Standard eigenvalue problem and requesting more than available
+        subset = [0, Ndof+5]
+        eigvals, eigvecs = solver.eigs(K, subset_by_index=subset)
+        
+        self.assertEqual(subset, [0, Ndof+5], 
+                         'Subset argument should not be modified.')
+        
+        self.assertLess(np.linalg.norm(eigvals - np.linalg.eigvalsh(K)), 
+                        1e-12*np.abs(eigvals).max(),
+                        'Incorrect eigenvalues for standard problem.')
+        
     def test_condition_fun(self):
         """
         Test that the conditioning function with the solver returns an 
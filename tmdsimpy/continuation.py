@@ -95,6 +95,14 @@ class Continuation:
                     Step size does not have any limits on how fast it can
                     decrease.
                     The default is 1.2.
+                max_dlam : float, optional
+                    Maximum change in `lam` (physical coordinates) that a 
+                    prediction is allowed to take for a step. If the 
+                    predicted change exceeds this, the step size is reduced
+                    (without going below `dsmin`) before solving so that 
+                    the predicted change is `max_dlam`. The corrector 
+                    may still change `lam` slightly more than `max_dlam`.
+                    The default is numpy.inf.
                 nsolve_verbose : int, optional
                     Setting passed to solver as
                     `solver.nsolve(verbose=nsolve_verbose)`
@@ -114,6 +122,34 @@ class Continuation:
                     Both of the arguments are in physical coordinates (not 
                     conditioned space).
                     The default is None.
+                intermediate_xtol_factor : float, optional
+                    Factor that multiplies `xtol` for the nonlinear solves of 
+                    the continuation steps after the initial point. This
+                    allows intermediate points to be solved to a looser 
+                    tolerance. The first step that reaches `lam1` is then 
+                    resolved with `xtol` so the final point is at the full 
+                    tolerance. Only used if `xtol` is not None.
+                    The default is 1.0.
+                predict_tol : float or None, optional
+                    If not None, the augmented residual is evaluated at the
+                    predicted point of each step before calling the 
+                    nonlinear solver. If the norm of that residual (scaled
+                    by `RPtoC`) is less than `predict_tol`, then the 
+                    prediction is accepted as the solution for that step and
+                    the nonlinear solver is not called.
+                    This requires that `fun` accepts `calc_grad=False` as a 
+                    second argument. 
+                    It is only beneficial if predictions are frequently
+                    accepted since it is an extra residual evaluation for 
+                    each step otherwise.
+                    The default is None.
+                history_dtype : numpy.dtype, optional
+                    Data type used to store the returned solution history 
+                    `XlamP_full`. For example, `numpy.float32` halves the 
+                    memory of the history for long continuations. 
+                    Calculations and the points passed to `callback` always 
+                    use full precision, only the stored history is reduced.
+                    The default is numpy.float64.
     
     See Also
     --------
@@ -139,6 +175,11 @@ class Continuation:
     tolerances based on the residual value are difficult to determine.
     It is recommended to avoid such tolerances.
     
+    The corrector type is checked when the object is initialized and at 
+    the start of each call to `continuation`. Changes to 
+    `config['corrector']` between those points are not used by 
+    `correct_res`.
+    
     Terminology:
     
         X : (N,) numpy.ndarray
@@ -171,7 +212,9 @@ class Continuation:
                 'Conditioning vector is expected to be 1D'
                 
             self.setCtoPto1 = False
-            self.CtoP = np.abs(CtoP)
+            
+            # Float to match the Jacobians that CtoP scales in place
+            self.CtoP = np.abs(CtoP).astype(np.float64, copy=False)
             
         if RPtoC is None:
             # Needed vector for using RPtoC in initial solve
@@ -196,15 +239,22 @@ class Continuation:
                         'FracLamList' : [], # FracLam options
                         'backtrackStop': np.inf, # Limits backtracking
                         'MaxIncrease': 1.2, # maximum step increase over 1 step
+                        'max_dlam' : np.inf, # max predicted change in lam
                         'nsolve_verbose' : False,
                         'callback' : None,
-                        'CtoPsave' : None
+                        'CtoPsave' : None,
+                        'intermediate_xtol_factor' : 1.0,
+                        'predict_tol' : None,
+                        'history_dtype' : np.float64
                         }
         
         
         for key in config.keys():
             default_config[key] = config[key]
             
+        # Copy so that the list passed in config is not modified below
+        default_config['FracLamList'] = list(default_config['FracLamList'])
+        
         # Make sure to always start with the value of 'FracLam' that is passed 
         # in before proceeding to the list of other possible values. 
         if len(default_config['FracLamList']) == 0 \
@@ -214,6 +264,22 @@ class Continuation:
             
         self.config = default_config
         
+        self._set_corrector()
+        
+        # Null space information from the last call to predict
+        self._predict_cache = None
+        
+    def _set_corrector(self):
+        """
+        Check `config['corrector']` and store the choice for `correct_res`.
+        """
+        
+        corrector = self.config['corrector'].upper()
+        
+        assert corrector in ('PSEUDO', 'ORTHO'), \
+            'Invalid corrector type: {}'.format(corrector)
+        
+        self._ortho_corrector = corrector == 'ORTHO'
         
     def predict(self, fun, XlamP0, XlamPprev, dirC_prev):
         """
@@ -274,45 +340,63 @@ class Continuation:
         making such an issue even more unlikely.
 
         2. If multiple FracLam values are used in the case of nonconvergence, 
-        then this function is repeatedly called, but those later calls should
-        not have to re-evaluate the residual and re-find the null space since
-        it has not changed. Therefore, this could be sped up by eliminating
-        that work on repeat calls at the same XlamP0 value.
+        then this function is repeatedly called at the same `XlamP0`. The 
+        residual and the null space do not change for those calls, so the 
+        unscaled null space vector from the last call is reused when
+        `fun`, `XlamP0`, and `CtoP` are all unchanged. Only the scaling and 
+        sign of the direction (which depend on FracLam) are recalculated. 
+        `dirC_prev` only sets the scale of the unscaled null space vector, so
+        it is not checked.
 
         """
         
-        R, dRdXP, dRdlamP = fun(XlamP0)
+        cache = self._predict_cache
         
-        # Augment the residual gradient with an additional equation 
-        # corresponding to an orthogonal constraint from the previous step
-        # dirC_prev is used here rather than (XlamP0 - XlamPprev) because
-        # for an orthogonal corrector, it is much harder for a previous
-        # step to result in a point with a tangent orthogonal to dirC_prev.
+        if cache is not None and cache['fun'] is fun \
+            and np.array_equal(cache['XlamP0'], XlamP0) \
+            and np.array_equal(cache['CtoP'], self.CtoP):
+            
+            dirC = cache['dirC']
+            self.RPtoC = cache['RPtoC']
+            
+        else:
+            dirC = self._null_direction(fun, XlamP0, dirC_prev)
+            
+            self._predict_cache = {'fun' : fun, 
+                                   'XlamP0' : np.copy(XlamP0), 
+                                   'CtoP' : np.copy(self.CtoP),
+                                   'dirC' : dirC, 
+                                   'RPtoC' : self.RPtoC}
         
-        # Conditioned space, (N+1,N+1) ndarray for augmented residual
-        dRdXlamC = np.vstack((np.hstack((dRdXP*self.CtoP[:-1], 
-                                 np.atleast_2d(dRdlamP).T*self.CtoP[-1])),
-                              dirC_prev))
+        return self._scale_direction(dirC, XlamP0, XlamPprev)
+    
+    def _scale_direction(self, dirC, XlamP0, XlamPprev):
+        """
+        Scale and sign a null space vector for the current `FracLam`.
         
-        # Want to still satisfy the first N equations described by fun
-        predictR = np.zeros(R.shape[0]+1)
+        Only this part of `predict` depends on `FracLam`. See `predict` for a 
+        description of the parameters.
         
-        # Want to deliberately violate the arc length condition of previous 
-        # step because this is to take a new step.
-        predictR[-1] = 1.0
-        
-        dirC = self.solver.lin_solve(dRdXlamC, predictR)
+        Parameters
+        ----------
+        dirC : (N+1,) numpy.ndarray
+            Unscaled null space direction from `_null_direction`.
         
+        Returns
+        -------
+        dirC : (N+1,) numpy.ndarray
+            Direction vector scaled to be a step size of ds = 1 with the sign
+            consistent with the direction between the previous two solutions.
+        """
         
         # Arc Length Weighting Parameters
         b = self.config['FracLam']
         XC0 = XlamP0[:-1] / self.CtoP[:-1]
         
-        # could store norm to eliminate an O(N) calculation each iteration
-        c = (1-b) / np.linalg.norm(XC0)**2 
+        c = (1-b) / (XC0 @ XC0)
         
         # Scale Direction so that it takes a step size of ds=1
-        step_sq = c*np.linalg.norm(dirC[:-1])**2 + b*dirC[-1]**2
+        step_sq = c*(dirC[:-1] @ dirC[:-1]) + b*dirC[-1]**2
         
         dirC = dirC / np.sqrt(step_sq)
         
@@ -324,17 +408,58 @@ class Continuation:
         
         signarg = c*dirC[:-1] @ dXlamCprev[:-1] + b*dirC[-1]*dXlamCprev[-1]
         
-        sign = np.sign(signarg)
-        
-        if sign == 0:
-            # choose direction arbitrarily if perfectly orthogonal
-            # could use dirC_prev to choose the sign here instead, but it is 
-            # extremely unlikely that true orthogonality would be hit in 
-            # practice
-            sign = 1 
+        # choose direction arbitrarily (positive) if perfectly orthogonal
+        # could use dirC_prev to choose the sign here instead, but it is 
+        # extremely unlikely that true orthogonality would be hit in 
+        # practice
+        sign = -1.0 if signarg < 0.0 else 1.0
         
+        # Not done in place since lin_solve may return an immutable JAX array
         dirC = dirC * sign
         
+        return dirC
+    
+    def _null_direction(self, fun, XlamP0, dirC_prev):
+        """
+        Unscaled null space vector of the residual gradient at `XlamP0`.
+        
+        Also updates `RPtoC` for the new step. See `predict` for a description
+        of the parameters.
+        
+        Returns
+        -------
+        dirC : (N+1,) numpy.ndarray
+            Null space direction in conditioned space before scaling and 
+            sign selection.
+        """
+        
+        R, dRdXP, dRdlamP = fun(XlamP0)
+        
+        # Augment the residual gradient with an additional equation 
+        # corresponding to an orthogonal constraint from the previous step
+        # dirC_prev is used here rather than (XlamP0 - XlamPprev) because
+        # for an orthogonal corrector, it is much harder for a previous
+        # step to result in a point with a tangent orthogonal to dirC_prev.
+        
+        # Conditioned space, (N+1,N+1) ndarray for augmented residual
+        # Blocks are written directly into the augmented matrix to avoid 
+        # temporary copies of the (N,N) gradient
+        N = R.shape[0]
+        dRdXlamC = np.empty((N+1, N+1))
+        
+        np.multiply(dRdXP, self.CtoP[:-1], out=dRdXlamC[:N, :N])
+        np.multiply(dRdlamP, self.CtoP[-1], out=dRdXlamC[:N, N])
+        dRdXlamC[N] = dirC_prev
+        
+        # Want to still satisfy the first N equations described by fun
+        predictR = np.zeros(N+1)
+        
+        # Want to deliberately violate the arc length condition of previous 
+        # step because this is to take a new step.
+        predictR[-1] = 1.0
+        
+        dirC = self.solver.lin_solve(dRdXlamC, predictR)
+        
         # Dynamic Scaling of Residual Vector
         if self.config['DynamicCtoP']:
             diagdRdX = np.diag(dRdXlamC)
@@ -342,11 +467,14 @@ class Continuation:
         else:
             # Currently, code does not support vector RPtoC after this point, 
             # so have to condense RPtoC to a scalar here for all cases.
-            self.RPtoC = np.mean(self.RPtoC)
+            # After the first step, RPtoC is already a scalar.
+            if not np.isscalar(self.RPtoC):
+                self.RPtoC = float(np.mean(self.RPtoC))
         
         return dirC
         
-    def pseudo_arc_res(self, XlamC, XlamC0, ds, b, c):
+    def pseudo_arc_res(self, XlamC, XlamC0, ds, b, c, out=None, 
+                       calc_grad=True):
         """
         Method calculates the scalar residual for the pseudo-arclength 
         corrector equation.
@@ -371,13 +499,23 @@ class Continuation:
         c : float
             Scaling on the `X` part of the inner product norm for measuring
             distance.
+        out : (N+1,) numpy.ndarray or None, optional
+            If provided, `dRarcdXlamC` is written into this array (e.g., the
+            last row of the augmented Jacobian) instead of a new array.
+            The default is None.
+        calc_grad : bool, optional
+            Flag to calculate the gradient. If False, `out` is ignored.
+            The default is True.
 
         Returns
         -------
         Rarc : float
             Residual for the arclength equation.
+            Always returned as the first entry in a tuple.
         dRarcdXlamC : (N+1,) numpy.ndarray
-            Derivative of `Rarc` with respect to `XlamC`.
+            Derivative of `Rarc` with respect to `XlamC`. 
+            This is `out` if `out` is provided.
+            Only returned as second entry in tuple if calc_grad=True.
 
         See Also
         --------
@@ -391,18 +529,24 @@ class Continuation:
         dXC   = XlamC[:-1] - XlamC0[:-1]
         
         #dstep_sq - step size squared
-        dstep_sq = c*np.linalg.norm(dXC)**2 + b*dlamC**2
-        
-        dstep_sq_dXC   = 2*c*dXC
-        dstep_sq_dlamC = 2*b*dlamC
+        dstep_sq = c*(dXC @ dXC) + b*dlamC**2
         
         Rarc =  (dstep_sq - ds**2)/ds**2
         
-        dRarcdXlamC = np.hstack((dstep_sq_dXC,dstep_sq_dlamC))/ds**2
+        if not calc_grad:
+            return (Rarc,)
+        
+        # Derivatives of dstep_sq are 2*c*dXC and 2*b*dlamC
+        if out is None:
+            out = np.empty(XlamC.shape[0])
         
-        return Rarc, dRarcdXlamC
+        np.multiply(dXC, 2*c/ds**2, out=out[:-1])
+        out[-1] = 2*b*dlamC/ds**2
+        
+        return Rarc, out
     
-    def orthogonal_arc_res(self, XlamC, XlamC0, dirC, ds, b, c):
+    def orthogonal_arc_res(self, XlamC, XlamC0, dirC, ds, b, c, out=None, 
+                           calc_grad=True):
         """
         Method calculates the scalar residual for the orthogonal corrector
         equation.
@@ -427,13 +571,23 @@ class Continuation:
         c : float
             Scaling on the `X` part of the inner product norm for measuring
             distance.
+        out : (N+1,) numpy.ndarray or None, optional
+            If provided, `dRarcdXlamC` is written into this array (e.g., the
+            last row of the augmented Jacobian) instead of a new array.
+            The default is None.
+        calc_grad : bool, optional
+            Flag to calculate the gradient. If False, `out` is ignored.
+            The default is True.
 
         Returns
         -------
         Rarc : float
             Residual for the arclength equation.
+            Always returned as the first entry in a tuple.
         dRarcdXlamC : (N+1,) numpy.ndarray
-            Derivative of `Rarc` with respect to `XlamC`.
+            Derivative of `Rarc` with respect to `XlamC`. 
+            This is `out` if `out` is provided.
+            Only returned as second entry in tuple if calc_grad=True.
 
         See Also
         --------
@@ -452,11 +606,19 @@ class Continuation:
         # would have residual O(1)
         Rarc = (c*(dXlamC[:-1] @ dirC[:-1]) + b*dXlamC[-1]*dirC[-1])/ds
         
-        dRarcdXlamC = np.hstack((c*dirC[:-1], b*dirC[-1]))/ds
+        if not calc_grad:
+            return (Rarc,)
+        
+        if out is None:
+            out = np.empty(XlamC.shape[0])
         
-        return Rarc, dRarcdXlamC
+        np.multiply(dirC[:-1], c/ds, out=out[:-1])
+        out[-1] = b*dirC[-1]/ds
+        
+        return Rarc, out
     
-    def correct_res(self, fun, XlamC, XlamC0, ds, dirC=None, calc_grad=True):
+    def correct_res(self, fun, XlamC, XlamC0, ds, dirC=None, calc_grad=True, 
+                    c=None):
         """
         Corrector residual function for system augmented with continuation
         equation.
@@ -486,6 +648,12 @@ class Continuation:
             Flag to calculate the gradient of the residual function and 
             arc length residual.
             The default is True.
+        c : float or None, optional
+            Scaling on the `X` part of the inner product norm for measuring
+            distance. This only depends on `XlamC0` and `config['FracLam']`, 
+            so it can be passed in to avoid recalculating it for every 
+            iteration of a step. If None, it is calculated from `XlamC0`.
+            The default is None.
 
         Returns
         -------
@@ -502,9 +670,6 @@ class Continuation:
         
         if calc_grad:
             R, dRdXP, dRdlamP = fun(XlamP)
-            
-            dRdXlamC = np.hstack((dRdXP*self.CtoP[:-1], 
-                                  np.atleast_2d(dRdlamP).T*self.CtoP[-1]))
         
         else:
             # No Gradient Calculation
@@ -514,23 +679,42 @@ class Continuation:
         # Relative Weighting of variables
         b = self.config['FracLam']
         
-        # could store to eliminate an O(N) calculation each iteration.
-        c = (1-b) / np.linalg.norm(XlamC0[:-1])**2 
+        if c is None:
+            c = (1-b) / (XlamC0[:-1] @ XlamC0[:-1])
         
-        if self.config['corrector'].upper() == 'PSEUDO':
-            Rarc, dRarcdXlamC = self.pseudo_arc_res(XlamC, XlamC0, ds, b, c)
-        elif self.config['corrector'].upper() == 'ORTHO':
+        # Augment R and dRdXlamC with the arc length equation
+        # Blocks are written directly into the augmented arrays to avoid 
+        # temporary copies of the (N,N) gradient
+        N = R.shape[0]
+        
+        if calc_grad:
+            dRaugdXlamC = np.empty((N+1, N+1))
+            
+            # Arc length gradient is written directly as the last row
+            arc_grad_out = dRaugdXlamC[N]
+        else:
+            arc_grad_out = None
+        
+        if self._ortho_corrector:
             assert not (dirC is None), 'In proper call, need dirC for ortho corrector.'
-            Rarc, dRarcdXlamC = self.orthogonal_arc_res(XlamC, XlamC0, dirC, ds, b, c)
+            Rarc = self.orthogonal_arc_res(XlamC, XlamC0, dirC, ds, b, c, 
+                                           out=arc_grad_out, 
+                                           calc_grad=calc_grad)[0]
         else:
-            assert False, 'Invalid corrector type: '\
-                + '{}'.format(self.config['corrector'].upper())
+            Rarc = self.pseudo_arc_res(XlamC, XlamC0, ds, b, c, 
+                                       out=arc_grad_out, 
+                                       calc_grad=calc_grad)[0]
         
-        # Augment R and dRdXlamC with the arc length equation
-        Raug = np.hstack((self.RPtoC*R, Rarc))
+        Raug = np.empty(N+1)
+        np.multiply(R, self.RPtoC, out=Raug[:N])
+        Raug[N] = Rarc
         
         if calc_grad:
-            dRaugdXlamC = np.vstack((self.RPtoC*dRdXlamC, dRarcdXlamC))
+            # Conditioning of both the residual and the unknowns
+            np.multiply(dRdXP, self.RPtoC*self.CtoP[:-1], 
+                        out=dRaugdXlamC[:N, :N])
+            np.multiply(dRdlamP, self.RPtoC*self.CtoP[-1], 
+                        out=dRaugdXlamC[:N, N])
     
             return Raug, dRaugdXlamC
         else:
@@ -717,8 +901,16 @@ class Continuation:
         if silent:
             self.config['verbose'] = 0
         
-        # Initialize Memory
-        XlamP_full = np.zeros((self.config['MaxSteps'], XlamP0.shape[0]))        
+        # Conditioning may be reset below, so do not reuse an old prediction
+        self._predict_cache = None
+        
+        self._set_corrector()
+        
+        # Initialize Memory, history is grown as needed up to MaxSteps rows 
+        # since continuation often terminates well before MaxSteps
+        XlamP_full = np.empty((min(256, self.config['MaxSteps']), 
+                               XlamP0.shape[0]), 
+                              dtype=self.config['history_dtype'])
         
         # Solve at Initial Point
         if not silent:
@@ -727,7 +919,7 @@ class Continuation:
         
         # Conditioning up front for static solution
         if self.setCtoPto1:
-            self.CtoP = np.ones_like(XlamP0)
+            self.CtoP = np.ones(XlamP0.shape[0])
             
         if self.setRPtoCto1:
             self.RPtoC = np.ones_like(XlamP0)
@@ -785,14 +977,30 @@ class Continuation:
             
         ds = self.config['ds0']
         
+        # Tolerance used for intermediate steps
+        if self.config['xtol'] is None:
+            step_xtol = None
+        else:
+            step_xtol = self.config['xtol'] \
+                            * self.config['intermediate_xtol_factor']
+        
+        # Stopping bounds on lam, multiplied by direct once so the loop 
+        # condition only scales the current lam
+        lam1_dir = direct*lam1
+        lam_stop_dir = direct*(lam0-direct*self.config['backtrackStop'])
+        
         while step < self.config['MaxSteps'] \
-            and direct*XlamP_full[step-1,-1] < direct*lam1 \
-            and direct*XlamP_full[step-1,-1] > direct*(lam0-direct*self.config['backtrackStop']): 
+            and lam1_dir > direct*XlamP0[-1] > lam_stop_dir: 
             #{ Continuation step loop
             
             # Update Conditioning Dynamically
             if self.config['DynamicCtoP']:
-                self.CtoP = np.maximum(np.abs(XlamP_full[step-1]), self.CtoP0)
+                self.CtoP = np.maximum(np.abs(XlamP0), self.CtoP0)
+            
+            # Previous solution in conditioned space is fixed for all 
+            # FracLam values and corrector iterations of this step
+            XlamC0 = XlamP0 / self.CtoP
+            XC0_sq = XlamC0[:-1] @ XlamC0[:-1]
                 
             for fracLam_ind in range(len(self.config['FracLamList'])): 
                 #{ fracLam loop
@@ -802,16 +1010,44 @@ class Continuation:
                 
                 # Predict Direction
                 dirC = self.predict(fun, XlamP0, XlamPprev, dirC)
-                                
+                
+                # Reject too large changes in lam before solving, 
+                # the prediction direction does not depend on ds
+                dlam_pred = float(np.abs(dirC[-1]*self.CtoP[-1]))*ds
+                
+                if dlam_pred > self.config['max_dlam']:
+                    ds = max(ds*self.config['max_dlam']/dlam_pred, 
+                             self.config['dsmin'])
+                
+                # Arc length weighting is fixed for all corrector iterations
+                c = (1 - self.config['FracLam']) / XC0_sq
+                
                 # Correct
                 correct_fun = lambda XlamC, calc_grad=True : \
-                        self.correct_res(fun, XlamC, XlamP0/self.CtoP, 
-                                         ds, dirC, calc_grad=calc_grad)
+                        self.correct_res(fun, XlamC, XlamC0, 
+                                         ds, dirC, calc_grad=calc_grad, c=c)
                 
-                XlamC, R, dRdX, sol = self.solver.nsolve(correct_fun, \
-                                        XlamP0/self.CtoP + dirC*ds,\
-                                        xtol=self.config['xtol'],\
-                                        verbose=self.config['nsolve_verbose'])
+                XlamC = XlamC0 + dirC*ds
+                
+                # Accept the prediction directly if it is already converged.
+                # The arc length residual is zero at the prediction.
+                accept_predict = False
+                
+                if self.config['predict_tol'] is not None:
+                    Raug = correct_fun(XlamC, calc_grad=False)[0]
+                    
+                    accept_predict = np.sqrt(Raug @ Raug) \
+                                        < self.config['predict_tol']
+                
+                if accept_predict:
+                    sol = {'success' : True, 
+                           'nfev' : 1, 
+                           'message' : 'Accepted prediction.'}
+                else:
+                    XlamC, R, dRdX, sol = self.solver.nsolve(correct_fun, \
+                                            XlamC,\
+                                            xtol=step_xtol,\
+                                            verbose=self.config['nsolve_verbose'])
                 
                 # Retry with smaller steps if correction failed.
                 while (not sol['success']) and ds > self.config['dsmin']:
@@ -825,8 +1061,8 @@ class Continuation:
                     
                     # Correct Again
                     XlamC, R, dRdX, sol = self.solver.nsolve(correct_fun, \
-                                        XlamP0/self.CtoP + dirC*ds,\
-                                        xtol=self.config['xtol'],\
+                                        XlamC0 + dirC*ds,\
+                                        xtol=step_xtol,\
                                         verbose=self.config['nsolve_verbose'])
             
                 # Break out of loop over FracLam values if have converged
@@ -842,11 +1078,35 @@ class Continuation:
                 print('Stopping since final solution failed to converge.')
                 break
             
+            # Resolve the final point to the full tolerance if intermediate 
+            # steps used a looser tolerance
+            if sol['success'] and step_xtol != self.config['xtol'] \
+                and direct*self.CtoP[-1]*XlamC[-1] >= lam1_dir:
+                
+                XlamC_final, R, dRdX, sol_final = self.solver.nsolve(
+                                        correct_fun, XlamC,
+                                        xtol=self.config['xtol'],
+                                        verbose=self.config['nsolve_verbose'])
+                
+                if sol_final['success']:
+                    XlamC = XlamC_final
+            
             # Store Iteration and Advance
-            XlamP_full[step] = self.CtoP * XlamC
+            if step == XlamP_full.shape[0]:
+                # Double the history size without exceeding MaxSteps
+                nrows = min(step, self.config['MaxSteps'] - step)
+                
+                XlamP_full = np.concatenate((XlamP_full, 
+                                    np.empty((nrows, XlamP_full.shape[1]), 
+                                             dtype=XlamP_full.dtype)))
+            
+            # Full precision solution is kept for the next step
+            XlamP = self.CtoP * XlamC
+            
+            XlamP_full[step] = XlamP
             
             if self.config['verbose'] and step % self.config['verbose'] == 0:
-                print('Step=', step, ' converged: lam=', XlamP_full[step, -1], \
+                print('Step=', step, ' converged: lam=', XlamP[-1], \
                       ' ds=', ds, ' and nfev=', sol['nfev'])
             
             # Heuristic For updating ds
@@ -857,19 +1117,20 @@ class Continuation:
             
             # Callback function
             if self.config['callback'] is not None:
-                self.config['callback'](XlamP_full[step], dirC*self.CtoP)
+                self.config['callback'](XlamP, dirC*self.CtoP)
                 if self.config['CtoPsave'] is not None:
                     np.savez(self.config['CtoPsave'], CtoP=self.CtoP)
             
             # Update information from previous steps
-            XlamPprev = np.copy(XlamP0)
-            XlamP0 = np.copy(XlamP_full[step])
+            XlamPprev = XlamP0
+            XlamP0 = XlamP
             step += 1
             
         #} End Continuation step loop  
         
-        # Only return solved history.
-        XlamP_full = XlamP_full[:step]
+        # Only return solved history (copy releases the unused rows).
+        if step < XlamP_full.shape[0]:
+            XlamP_full = XlamP_full[:step].copy()
         
         # Callback - save the final dirC 
         if self.config['callback'] is not None:
@@ -919,8 +1180,15 @@ def _initial_wrapper_fun(fun, X, lam0, calc_grad=True):
         `fun`, but still in a tuple.
 
     """
+    # Fill a new array rather than calling np.hstack on every evaluation.
+    # A new array is still needed each call since fun (or the nonlinear 
+    # forces in it) may keep references to its input.
+    Xlam = np.empty(X.shape[0]+1, dtype=np.result_type(X, lam0))
+    Xlam[:-1] = X
+    Xlam[-1] = lam0
+    
     if calc_grad:
-        return fun( np.hstack((X, lam0)) )[0:2]
+        return fun(Xlam)[0:2]
     else:
-        return fun( np.hstack((X, lam0)), calc_grad=False)[0:1]
+        return fun(Xlam, calc_grad=False)[0:1]
 
@@ -131,25 +131,21 @@ def time_series_deriv(Nt, htuple, X0, order):
         
         X0full = D @ X0full
     
-    # Extend X0full to have coefficients corresponding to Nt times for ifft
-    #   Previous MATLAB implementation did this before rotating harmonics, but
-    #   that seems rather inefficient in increasing the size of the matrix 
-    #   multiplication
+    # Real inverse FFT only needs the positive frequency coefficients, 
+    # the negative frequencies follow from conjugate symmetry.
     Nht = int(Nt/2 -1)
-    X0full = jnp.vstack((X0full,np.zeros((2*(Nht-Nh), nd)) ))
     Nt = 2*Nht+2
 
-    # Fourier Coefficients    
-    Xf = jnp.vstack((2*X0full[0, :], \
+    # Fourier Coefficients (zero above Nh, including the Nyquist frequency)
+    Xf = jnp.vstack((2*X0full[0:1, :], \
          X0full[1::2, :] - 1j*X0full[2::2], \
-         jnp.zeros((1, nd)), \
-         X0full[-2:0:-2, :] + 1j*X0full[-1:1:-2]))
+         jnp.zeros((Nht+1-Nh, nd))))
         
     Xf = Xf * (Nt/2)
          
-    assert Xf.shape[0] == Nt, 'Unexpected length of Fourier Coefficients'
+    assert Xf.shape[0] == Nht+2, 'Unexpected length of Fourier Coefficients'
     
-    x_t = jnp.real(jnp.fft.ifft(Xf, axis=0))
+    x_t = jnp.fft.irfft(Xf, n=Nt, axis=0)
     
     return x_t
 
@@ -203,20 +199,21 @@ def get_fourier_coeff(htuple, x_t):
     
     assert ((h == 0).sum() == 0 or h[0] == 0), 'Zeroth harmonic must be first'
     
-    v = jnp.zeros((Nhc, nd))
+    # Only the non-negative frequencies are needed for real input
+    xf = jnp.fft.rfft(x_t, axis=0)
+    
+    hpos = h[h != 0]
     
-    xf = jnp.fft.fft(x_t, axis=0)
+    v = jnp.zeros((Nhc, nd))
         
     if h[0] == 0:
         v = v.at[0, :].set(jnp.real(xf[0, :])/Nt)
         zi = 1
     else:
         zi = 0
-
-    # As long as h is treated as static, this is safe for this for loop
-    for i in range(n):
-        hi = h[i + zi]
-        v = v.at[2*i+zi].set(jnp.real(xf[hi, :]) / (Nt/2))
-        v = v.at[2*i+1+zi].set(-jnp.imag(xf[hi, :]) / (Nt/2))
+    
+    # h is static, so the gather indices are known at compile time
+    v = v.at[zi::2].set(jnp.real(xf[hpos, :]) / (Nt/2))
+    v = v.at[zi+1::2].set(-jnp.imag(xf[hpos, :]) / (Nt/2))
     
     return v
@@ -295,23 +295,12 @@ class ElasticDryFriction2D(NonlinearForce):
         the nonlinear forces are calculated automatically without the option to
         change this setting.
 
-        A numpy `kron` operation is utilized to convert forces back to physical
-        domain. This operation may result in many unnecessary calculations that
-        could be eliminated to speed up AFT.
+        The Jacobian is converted back to the physical domain by applying
+        `Q` and `T` to each harmonic block rather than with a numpy `kron`.
 
         """
 
         
-        #########################
-        # Memory Initialization 
-        
-        Fnl = np.zeros_like(U)
-        
-        if calc_grad:
-            dFnldU = np.zeros((U.shape[0], U.shape[0]))
-            dFnldw = np.zeros_like(U)
-        
-        
         #########################
         # Transform to Local Coordinates
         
@@ -361,8 +350,7 @@ class ElasticDryFriction2D(NonlinearForce):
         Fnl = np.reshape(self.T @ Flocal, (U.shape[0],), 'F')
         
         if calc_grad:
-            dFnldU = np.kron(np.eye(Nhc), self.T) @ dFdUwlocal[:, :-1] \
-                                                    @ np.kron(np.eye(Nhc), self.Q)
+            dFnldU = self._jacobian_to_global(dFdUwlocal[:, :-1], Nhc)
             
             dFnldw = np.reshape(self.T @ \
                                 np.reshape(dFdUwlocal[:, -1], (Ndnl, Nhc)), \
@@ -652,7 +640,7 @@ def _local_aft_eldry(Uwlocal, pars, u0, htuple, Nt, u0h0, meso_gap):
     #
     # Ulocal is (Nhc x Ndnl) - each column is the harmonic components for a 
     # single nonlinear DOF.
-    Ulocal = jnp.reshape(Uwlocal[:-1], (Ndnl, Nhc), 'F').T
+    Ulocal = jnp.reshape(Uwlocal[:-1], (Nhc, Ndnl))
 
     
     ########################################
@@ -673,15 +661,15 @@ def _local_aft_eldry(Uwlocal, pars, u0, htuple, Nt, u0h0, meso_gap):
     # if u0 comes from the zeroth harmonic, pull it from the jax traced 
     # array rather than the separate input value, which is constant as far as 
     # gradients are concerned.
-    u0 = jnp.where(u0h0, Ulocal[0, 0::2], u0[0::2])
+    u0 = Ulocal[0, 0::2] if u0h0 else u0[0::2]
     
     ft = _local_force_history(unlt, pars, u0, meso_gap)
     
     # Convert back into frequency domain
     Flocal = jhutils.get_fourier_coeff(htuple, ft)
     
-    # Flatten back to a 1D array
-    Flocal = jnp.reshape(Flocal.T, (-1,), 'F')
+    # Flatten back to a 1D array, row-major order lists each harmonic in full
+    Flocal = jnp.reshape(Flocal, (-1,))
     
     return Flocal,Flocal
         
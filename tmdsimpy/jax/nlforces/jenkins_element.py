@@ -16,21 +16,23 @@ from ...nlforces.nonlinear_force import NonlinearForce
 
 class JenkinsForce(NonlinearForce):
     """
-    Single Jenkins slider element nonlinearity with JAX for automatic 
+    Jenkins slider element nonlinearity with JAX for automatic 
     differentiation.
 
     Parameters
     ----------
-    Q : (1, N) numpy.ndarray
+    Q : (Nnl, N) numpy.ndarray
         Matrix tranform from the `N` degrees of freedom (DOFs) of the system 
         to the `Nnl` local nonlinear DOFs.
-    T : (N, 1) numpy.ndarray
+    T : (N, Nnl) numpy.ndarray
         Matrix tranform from the local `Nnl` forces to the `N` global DOFs.
-    kt : float
-        Tangential stiffness.
-    Fs : float
-        Slip force.
-    u0 : float or None, optional
+    kt : float or (Nnl,) numpy.ndarray
+        Tangential stiffness. An array gives a separate stiffness for each
+        local nonlinear DOF.
+    Fs : float or (Nnl,) numpy.ndarray
+        Slip force. An array gives a separate slip force for each
+        local nonlinear DOF.
+    u0 : float, (Nnl,) numpy.ndarray, or None, optional
         Initialization value for the slider for AFT. 
         If `u0 = None`, then the zeroth harmonic is used to initialize 
         the slider position.
@@ -55,10 +57,11 @@ class JenkinsForce(NonlinearForce):
     The `force` method is not implemented here since this is just an example
     of automatic differentiation for AFT.
     
-    It may be possible to do some calculations with multiple nonlinear 
-    elements, but such cases are not tested or fully supported.
-    It would probably be relatively straightforward to extend this to multiple
-    elements, but this serves more as a demonstration of JAX, JIT, and autodiff
+    Each local nonlinear DOF is an independent Jenkins element. All elements
+    are evaluated together in a single compiled AFT kernel, so many parallel
+    sliders can be included with one `JenkinsForce` rather than creating 
+    one instance per element.
+    This class serves more as a demonstration of JAX, JIT, and autodiff
     for a frictional element than an implementation to be used.
     
     """
@@ -113,7 +116,7 @@ class JenkinsForce(NonlinearForce):
         
         self.Fs = self.real_Fs
         
-    def aft(self, U, w, h, Nt=128, tol=1e-7):
+    def aft(self, U, w, h, Nt=128, tol=1e-7, calc_grad=True):
         """
         Implementation of the alternating frequency-time (AFT) method to
         extract harmonic nonlinear force coefficients.
@@ -134,6 +137,10 @@ class JenkinsForce(NonlinearForce):
             This argument is ignored, and is included for compatability of 
             interface. 
             The default is 1e-7.
+        calc_grad : boolean
+            Flag where True indicates that the gradients should be calculated 
+            and returned. If False, then returns only (Fnl,) as a tuple. 
+            The default is True
         
         Returns
         -------
@@ -153,14 +160,6 @@ class JenkinsForce(NonlinearForce):
 
         """
         
-        #########################
-        # Memory Initialization 
-        
-        Fnl = np.zeros_like(U)
-        dFnldU = np.zeros((U.shape[0], U.shape[0]))
-        dFnldw = np.zeros_like(U)
-        
-        
         #########################
         # Transform to Local Coordinates
         
@@ -185,16 +184,20 @@ class JenkinsForce(NonlinearForce):
         
         #########################
         # Conduct AFT in Local Coordinates with JAX
-        Uwlocal = np.hstack((np.reshape(Ulocal.T, (Ndnl*Nhc,), 'F'), w))
-        
-        pars = np.array([self.kt, self.Fs])
+        # Jenkins is rate independent, so frequency is not passed to JAX.
+        Ulocal_flat = np.reshape(Ulocal.T, (Ndnl*Nhc,), 'F')
         
-        # # If no Grad is needed use:
-        # Flocal = _local_aft_jenkins(Uwlocal, pars, u0, tuple(h), Nt, u0h0)[0]
+        # Parameters as (2,) for scalars or (2, Ndnl) for each element
+        pars = np.stack(np.broadcast_arrays(self.kt, self.Fs))
         
-        # Case with gradient and local force
-        dFdUwlocal, Flocal = _local_aft_jenkins_grad(Uwlocal, pars, u0, \
-                                                     tuple(h), Nt, u0h0)
+        if calc_grad:
+            # Case with gradient and local force
+            dFdUlocal, Flocal = _local_aft_jenkins_grad(Ulocal_flat, pars, u0, \
+                                                        tuple(h), Nt, u0h0)
+        else:
+            # Forward evaluation only, skips the tangents of jacfwd
+            Flocal,_ = _local_aft_jenkins(Ulocal_flat, pars, u0, \
+                                          tuple(h), Nt, u0h0)
         
         
         #########################
@@ -205,46 +208,48 @@ class JenkinsForce(NonlinearForce):
                 
         # Global coordinates        
         Fnl = np.reshape(self.T @ Flocal, (U.shape[0],), 'F')
-        dFnldU = np.kron(np.eye(Nhc), self.T) @ dFdUwlocal[:, :-1] \
-                                                @ np.kron(np.eye(Nhc), self.Q)
         
-        dFnldw = np.reshape(self.T @ \
-                            np.reshape(dFdUwlocal[:, -1], (Ndnl, Nhc)), \
-                            (U.shape[0],), 'F')
-        
-        return Fnl, dFnldU, dFnldw
+        if calc_grad:
+            dFnldU = self._jacobian_to_global(dFdUlocal, Nhc)
+            
+            # Rate independent force
+            dFnldw = np.zeros_like(U)
+            
+            return Fnl, dFnldU, dFnldw
+        else:
+            return (Fnl,)
         
 
-def _local_jenkins_loop_body(ind, ft, unlt, kt, Fs):
+def _local_jenkins_scan_body(carry, ucurr, kt, Fs):
     """
     Function for calculating a single force update for Jenkins. This is
-    constructed as a loop body function for JAX and thus evaluates for a 
-    specific index given the full arrays for the force and displacement 
-    time series.
+    constructed as a scan body function for JAX and thus only carries the
+    force and displacement of the previous time instant.
 
     Parameters
     ----------
-    ind : Index that is being updated for this loop step.
-    ft : Array of force values for all time (Nt,)
-    unlt : Displacements for Jenkins for all times (Nt,)
+    carry : Tuple of (fprev, uprev), the force and displacement at the 
+            previous time instant (Ndnl,)
+    ucurr : Displacements for Jenkins at the current time instant (Ndnl,)
     kt : Tangential stiffness parameter
     Fs : Slip Force parameter
 
     Returns
     -------
-    ft : Force array with the entry at ind updated for Jenkins nonlinear force
+    carry : Tuple of (fcurr, ucurr) for the next time instant
+    fcurr : Force at the current time instant for Jenkins nonlinear force
 
     """
     
-    fcurr = jnp.minimum(kt*(unlt[ind, :]-unlt[ind-1, :]) + ft[ind-1, :], Fs)
+    fprev, uprev = carry
     
-    ft = ft.at[ind, :].set(jnp.maximum(fcurr, -Fs))
+    fcurr = jnp.clip(kt*(ucurr-uprev) + fprev, -Fs, Fs)
     
-    return ft
+    return (fcurr, ucurr), fcurr
  
 
 @partial(jax.jit, static_argnums=(3,4,5)) 
-def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
+def _local_aft_jenkins(Ulocal_flat, pars, u0, htuple, Nt, u0h0):
     """
     Conducts AFT in a functional form that can be used with JAX and JIT
 
@@ -257,12 +262,14 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
 
     Parameters
     ----------
-    Uwlocal : jax.numpy array with displacements at local nonlinear DOFs 
-                followed by frequency. Each harmonic is listed in full
-                then the next harmonic ect. Size (Nhc*Ndnl + 1,)
+    Ulocal_flat : jax.numpy array with displacements at local nonlinear DOFs.
+                Each harmonic is listed in full then the next harmonic ect. 
+                Size (Nhc*Ndnl,)
     pars : jax.numpy array with parameters [kt, Fs]. Bundled this way in case
             future work is interested in applying autodiff w.r.t. parameters
-    u0 : scalar value for the displacement to initialize the slider to
+            Size (2,) or (2, Ndnl) for separate parameters for each element
+    u0 : scalar value or (Ndnl,) array for the displacement to initialize 
+            the slider to
     htuple : tuple containing the list of harmonics. Tuple is used so the 
             argument can be made static. 
     Nt : Number of AFT time steps to be used. 
@@ -274,7 +281,7 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     Returns
     -------
     Flocal : Nhc*Ndl array of the harmonic force coefficients locally. 
-             Same format as U part of Uwlocal 
+             Same format as Ulocal_flat 
     Flocal : Flocal is returned again as aux data so it can be accessed when
                 gradient is calculated with JAX
 
@@ -285,19 +292,19 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     
     # Size Calculation
     Nhc = hutils.Nhc(np.array(htuple))
-    Ndnl = int(Uwlocal.shape[0] / Nhc)
+    Ndnl = int(Ulocal_flat.shape[0] / Nhc)
     
     # Recover pars for convenience
     kt = pars[0]
     Fs = pars[1]
     
-    # Uwlocal is arranged as all of harmonic 0, then all of 1c, etc. 
-    # For each harmonic it has the DOFs in order. Finally there is frequency.
+    # Ulocal_flat is arranged as all of harmonic 0, then all of 1c, etc. 
+    # For each harmonic it has the DOFs in order.
     # This is a 1d array. 
     #
     # Ulocal is (Nhc x Ndnl) - each column is the harmonic components for a 
     # single nonlinear DOF.
-    Ulocal = jnp.reshape(Uwlocal[:-1], (Ndnl, Nhc), 'F').T
+    Ulocal = jnp.reshape(Ulocal_flat, (Nhc, Ndnl))
 
     
     ########################################
@@ -307,15 +314,14 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     # Nt x Ndnl
     unlt = jhutils.time_series_deriv(Nt, htuple, Ulocal, 0) # Nt x Ndnl
     
-    # Do not need velocity for Jenkins, this is how it would be calculated:
+    # Do not need velocity for Jenkins, this is how it would be calculated
+    # if frequency w were also passed in:
     # # Nt x Ndnl
-    # unltdot = Uwlocal[-1]*jhutils.time_series_deriv(Nt, htuple, Ulocal, 1) 
+    # unltdot = w*jhutils.time_series_deriv(Nt, htuple, Ulocal, 1) 
     
-    # Initialize force time memory
-    ft = jnp.zeros_like(unlt)
-    
-    # Do a loop function for each update at index i
-    loop_fun = lambda i,f : _local_jenkins_loop_body(i, f, unlt, kt, Fs)
+    # Scan function for each update, only the previous time instant is 
+    # carried between steps
+    scan_fun = lambda carry,u : _local_jenkins_scan_body(carry, u, kt, Fs)
     
     
     ########################################
@@ -324,40 +330,42 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     # if u0 comes from the zeroth harmonic, pull it from the jax traced 
     # array rather than the separate input value, which is constant as far as 
     # gradients are concerned.
-    u0 = jnp.where(u0h0, Ulocal[0, 0:1], u0)
+    u0 = Ulocal[0, :] if u0h0 else u0
     
-    # The first evaluation is based on the last entry of ft and therefore 
-    # initialize the last entry of ft based on a linear spring
+    # The first evaluation is based on the last time instant and therefore 
+    # initialize the force at the last time based on a linear spring
     # slip limit does not need to be applied since this just needs to get stuck
     # regime correct for the first step to be through zero. 
-    ft = ft.at[-1, :].set(kt*(unlt[-1, :] - u0))
+    carry = (kt*(unlt[-1, :] - u0), unlt[-1, :])
     
     # Conduct exactly 2 repeats of the hysteresis loop to be converged to 
-    # steady-state
-    for out_ind in range(2):
-        
-        # This construct must be used otherwise compiling tries writing out
-        # all Nt steps of the loop updates and is excessively slow
-        ft = jax.lax.fori_loop(0, Nt, loop_fun, ft)
+    # steady-state in a single scan over two copies of the cycle. 
+    # Only the second repeat is kept.
+    # A scan must be used otherwise compiling tries writing out
+    # all Nt steps of the loop updates and is excessively slow
+    carry, ft = jax.lax.scan(scan_fun, carry, 
+                             jnp.concatenate((unlt, unlt), axis=0))
+    
+    ft = ft[Nt:, :]
     
     # Convert back into frequency domain
     Flocal = jhutils.get_fourier_coeff(htuple, ft)
     
-    # Flatten back to a 1D array
-    Flocal = jnp.reshape(Flocal.T, (-1,), 'F')
+    # Flatten back to a 1D array, row-major order lists each harmonic in full
+    Flocal = jnp.reshape(Flocal, (-1,))
     
     return Flocal,Flocal
         
 
 @partial(jax.jit, static_argnums=(3,4,5)) 
-def _local_aft_jenkins_grad(Uwlocal, pars, u0, htuple, Nt, u0h0):
+def _local_aft_jenkins_grad(Ulocal_flat, pars, u0, htuple, Nt, u0h0):
     """
     Function that computes the gradient of AFT. Using Aux data allows for 
     returning Flocal also from one function call. 
 
     Parameters
     ----------
-    Uwlocal : Displacements and frequency as defined for _local_aft_jenkins
+    Ulocal_flat : Displacements as defined for _local_aft_jenkins
     pars : Parameters as defined for _local_aft_jenkins
     u0 : scalar value for the displacement to initialize the slider to
     htuple : List of harmonics, tuple, use tuple(h) so can be set to static.
@@ -368,12 +376,12 @@ def _local_aft_jenkins_grad(Uwlocal, pars, u0, htuple, Nt, u0h0):
 
     Returns
     -------
-    J : Jacobian of _local_aft_jenkins w.r.t. Uwlocal
+    J : Jacobian of _local_aft_jenkins w.r.t. Ulocal_flat
     F : Normal output argument (nonlinear force) of _local_aft_jenkins
 
     """
     
-    J,F = jax.jacfwd(_local_aft_jenkins, has_aux=True)(Uwlocal, pars, u0, 
+    J,F = jax.jacfwd(_local_aft_jenkins, has_aux=True)(Ulocal_flat, pars, u0, 
                                                        htuple, Nt, u0h0)
     
     return J,F
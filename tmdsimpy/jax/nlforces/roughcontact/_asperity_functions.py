@@ -288,7 +288,8 @@ def _tangential_asperity(uxy, uxy0, fxy0, fn, a, Gstar, mu):
     # Stuck calculation
     fxy = jnp.outer(kt,(uxy - uxy0)) + fxy0
     
-    fs = jnp.outer(mu*fn,np.ones(2))
+    # Slip limit for each asperity, broadcast to both directions
+    fs = jnp.reshape(mu*fn, (-1, 1))
     
     # Positive slip
     fxy = jnp.minimum(fxy, fs)
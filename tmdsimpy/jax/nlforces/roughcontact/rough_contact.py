@@ -40,9 +40,12 @@ class RoughContactFriction(NonlinearForce):
 
     Parameters
     ----------
-    Q : (3, N) numpy.ndarray
-        Transformation matrix from system DOFs (`N`) to nonlinear DOFs (`3`).
-    T : (N, 3) numpy.ndarray
+    Q : (3*Nel, N) numpy.ndarray
+        Transformation matrix from system DOFs (`N`) to nonlinear DOFs 
+        (`3` for each of the `Nel` contact elements).
+        Generally, `Nel=1`, 
+        see `from_batch` for creating an object with many elements.
+    T : (N, 3*Nel) numpy.ndarray
         Transformation matrix from local nonlinear forces to global
         nonlinear forces.
     ElasticMod : float
@@ -68,9 +71,10 @@ class RoughContactFriction(NonlinearForce):
         If a `(3,) numpy.ndarray`, then it sets all three directions with the
         given values (but the normal direction should be irrelevant).
         The default is 0.
-    meso_gap : float, optional
+    meso_gap : float or (Nel,) numpy.ndarray, optional
         Initial gap between contact due to other (e.g. mesoscale) topology.
         This gap is added to the gaps of all asperities in the integral.
+        If an array, each entry is the gap for the corresponding element.
         The default is 0.
     gaps : (Nasp,) numpy.ndarray
         Initial gaps between asperities that forces should be calculated
@@ -88,6 +92,13 @@ class RoughContactFriction(NonlinearForce):
         Number of radial quadrature points to use for each contact asperity 
         when using the `tangent_model == 'MIF'`.
         The default is 100.
+    use_pmap : bool, optional
+        If True, the elements are split between the local JAX devices with 
+        `jax.pmap` so that they are evaluated in parallel. JAX only creates 
+        several CPU devices if the environment variable `XLA_FLAGS` is set to
+        `--xla_force_host_platform_device_count=N` before JAX is imported.
+        With a single local device, this option has no effect.
+        The default is False.
         
         
     Notes
@@ -98,12 +109,21 @@ class RoughContactFriction(NonlinearForce):
     the first time here and was used in frequency domain with plasticity
     normal contact for the first time in [2]_.
     
-    Implementation currently requires exactly three nonlinear DOFs
-    corresponding to a single location.
+    Implementation requires exactly three nonlinear DOFs
+    corresponding to each contact location (element).
     The Nonlinear DOFs must first be both tangential displacement then 
     normal displacement.
+    When `Nel > 1`, the three DOFs of the first element are listed first,
+    followed by those of the second element etc.
+    All elements share the same surface and material parameters, 
+    but may have different `meso_gap` values.
     
     Implementation uses automatic differentiation with JAX.
+    Calculations for all elements are vectorized with `jax.vmap`, so 
+    one object with many elements requires many fewer calls to JAX than 
+    many objects with a single element each.
+    Splitting the elements between devices with `use_pmap=True` has not
+    been benchmarked against evaluating them all on one device.
     
     References
     ----------
@@ -122,7 +142,8 @@ class RoughContactFriction(NonlinearForce):
 
     def __init__(self, Q, T, ElasticMod, PoissonRatio, Radius, TangentMod, 
                  YieldStress, mu, u0=0, meso_gap=0, gaps=None, 
-                 gap_weights=None, tangent_model='TAN', N_radial_quad=100):
+                 gap_weights=None, tangent_model='TAN', N_radial_quad=100,
+                 use_pmap=False):
         
         self.Q = np.asarray(Q)
         self.T = np.asarray(T)
@@ -136,20 +157,31 @@ class RoughContactFriction(NonlinearForce):
             warnings.warn('Matrix T argument is not a numpy array. Conversion '
                           'to numpy array was attempted, but not '
                           'guaranteed to work.')
-        
-        self.elastic_mod = ElasticMod
-        self.poisson = PoissonRatio
-        self.Re = Radius
-        self.tangent_mod = TangentMod
-        self.sys = YieldStress
+            
+        # Number of contact elements (each with 3 local DOFs)
+        self.Nel = self.Q.shape[0] // 3
+        
+        assert self.Q.shape[0] == 3*self.Nel, \
+            'Matrix Q must have 3 rows for each contact element.'
+        
+        assert self.T.shape[1] == 3*self.Nel, \
+            'Matrix T must have 3 columns for each contact element.'
+        
+        # Material properties are static arguments for the JAX functions, 
+        # Python floats are always hashable and compare equal between calls
+        self.elastic_mod = float(ElasticMod)
+        self.poisson = float(PoissonRatio)
+        self.Re = float(Radius)
+        self.tangent_mod = float(TangentMod)
+        self.sys = float(YieldStress)
         self.mu = mu # This friction coefficient sometimes switches between real and prestress
         self.real_mu = mu # Save real friction coefficient
         self.prestress_mu = 0.0 # Prestress should use zero friction coefficient
         
         # Calculated Initial Parameters
-        self.Estar = ElasticMod / 2.0 / (1.0 - PoissonRatio**2)
+        self.Estar = self.elastic_mod / 2.0 / (1.0 - self.poisson**2)
         
-        self.shear_mod = ElasticMod / 2.0 / (1.0 + PoissonRatio)
+        self.shear_mod = self.elastic_mod / 2.0 / (1.0 + self.poisson)
 
         self.Gstar = self.shear_mod / 2.0 / (2.0 - PoissonRatio)
         
@@ -159,10 +191,11 @@ class RoughContactFriction(NonlinearForce):
         # displacement of one sphere against a rigid flat to cause yielding.
         delta_y1s = (np.pi*C*self.sys/(2*(2*self.Estar)))**2*(2*self.Re); 
         
-        self.delta_y = delta_y1s*2
+        self.delta_y = float(delta_y1s*2)
         
         # Topology and distribution of asperity parameters 
-        self.meso_gap = meso_gap
+        self.meso_gap = np.asarray(meso_gap, dtype=np.float64) \
+                            * np.ones(self.Nel)
         
         if gaps is None:
             # self.gaps = 
@@ -193,26 +226,79 @@ class RoughContactFriction(NonlinearForce):
             self.quad_radii = 0.0
             self.weight_radii = 1.0
             
+        # Splitting elements between devices is only done if requested
+        self.use_pmap = use_pmap
+        
             
         # Just consider default of starting sliders at origin for AFT
-        self.u0 = np.array([0.0, 0.0, 0.0])
+        u0_el = np.zeros((self.Nel, 3))
         if isinstance(u0, np.ndarray):
             if u0.shape[0] == 1 or u0.shape[0] == 2:
-                self.u0[:2] = u0
+                u0_el[:, :2] = u0
             elif u0.shape[0] == 3:
                 # setting all coordinates
-                self.u0 = u0
+                u0_el[:, :] = u0
+            elif u0.shape[0] == 3*self.Nel:
+                # setting all coordinates of all elements
+                u0_el = np.reshape(u0, (self.Nel, 3))
             else:
                 assert False, \
                     'Shape of numpy.ndarray u0 is expected to be '\
-                    + '(1,), (2,) or (3,)'
+                    + '(1,), (2,), (3,) or (3*Nel,)'
         else:
             # assume that it is a scalar float to set the two tangential
             # directions
-            self.u0[:2] = u0
+            u0_el[:, :2] = u0
+            
+        self.u0 = np.reshape(u0_el, (3*self.Nel,))
         
         # Initialize History Variables
         self.init_history()
+        
+    @classmethod
+    def from_batch(cls, Ls_all, Lf_all, ElasticMod, PoissonRatio, Radius, 
+                   TangentMod, YieldStress, mu, **kwargs):
+        """
+        Create a single nonlinear force for a set of contact elements.
+
+        Parameters
+        ----------
+        Ls_all : (Nel, 3, N) numpy.ndarray
+            Stacked transformation matrices from system DOFs (`N`) to 
+            the nonlinear DOFs of each of the `Nel` elements.
+        Lf_all : (Nel, N, 3) numpy.ndarray
+            Stacked transformation matrices from the local nonlinear forces 
+            of each element to global nonlinear forces.
+        ElasticMod, PoissonRatio, Radius, TangentMod, YieldStress, mu : float
+            Parameters shared by all elements, see `RoughContactFriction`.
+        **kwargs
+            Passed to `RoughContactFriction`. Notably, `meso_gap` can be a
+            `(Nel,) numpy.ndarray` to give each element a different gap.
+
+        Returns
+        -------
+        nlforce : RoughContactFriction
+            A single nonlinear force that evaluates all `Nel` elements 
+            together.
+        
+        Notes
+        -----
+        Evaluating the contact forces of `Nel` elements with a single object
+        is equivalent to adding `Nel` separate objects to a vibration system,
+        but avoids `Nel` separate calls to JAX for each function evaluation.
+
+        """
+        
+        Ls_all = np.asarray(Ls_all)
+        Lf_all = np.asarray(Lf_all)
+        
+        Nel = Ls_all.shape[0]
+        
+        Q = np.reshape(Ls_all, (3*Nel, Ls_all.shape[2]))
+        T = np.reshape(np.transpose(Lf_all, (1, 0, 2)), (Lf_all.shape[1], 3*Nel))
+        
+        return cls(Q, T, ElasticMod, PoissonRatio, Radius, TangentMod, 
+                   YieldStress, mu, **kwargs)
 
     def nl_force_type(self):
         """
@@ -249,24 +335,28 @@ class RoughContactFriction(NonlinearForce):
         sliders. Maximum previous normal displacement is set to zero 
         (for normal plasticity).
         
+        History variables have a leading axis for the `Nel` elements.
+        
         """
         
-        self.unmax = 0
-        self.Fm_prev = np.zeros_like(self.gap_weights)
-        self.uxyn0 = np.zeros(3)
+        self.unmax = np.zeros(self.Nel)
+        self.Fm_prev = np.zeros((self.Nel, self.gap_weights.shape[0]))
+        self.uxyn0 = np.zeros(3*self.Nel)
         
         if self.tangent_model == 'TAN':
             
-            self.fxy0 = np.zeros((self.gap_weights.shape[0], 2))
-            self.quad_radii0 = 0
+            self.fxy0 = np.zeros((self.Nel, self.gap_weights.shape[0], 2))
+            self.quad_radii0 = np.zeros(self.Nel)
             
         elif self.tangent_model == 'MIF':
             
-            self.fxy0 = np.zeros((self.gap_weights.shape[0], 
+            self.fxy0 = np.zeros((self.Nel, 
+                                  self.gap_weights.shape[0], 
                                   self.quad_radii.shape[0], 
                                   2))
             
-            self.quad_radii0 = np.zeros((self.gap_weights.shape[0], 
+            self.quad_radii0 = np.zeros((self.Nel, 
+                                         self.gap_weights.shape[0], 
                                          self.quad_radii.shape[0]))
 
     
@@ -276,17 +366,17 @@ class RoughContactFriction(NonlinearForce):
 
         Parameters
         ----------
-        uxyn : (3,) numpy.ndarray
+        uxyn : (3*Nel,) numpy.ndarray
             Local displacements in two tangent and then one normal direction
-            for the given location.
-        Fm_curr : (Nasp,) numpy.ndarray
+            for each element.
+        Fm_curr : (Nel,Nasp) numpy.ndarray
             Maximum normal force for each asperity at the current instant
             or any previous instant.
-        fxy_curr : (Nasp,2) numpy.ndarray or (Nasp,Nrad,2) numpy.ndarray
+        fxy_curr : (Nel,Nasp,2) numpy.ndarray or (Nel,Nasp,Nrad,2) numpy.ndarray
             Sizes are for the 'TAN' and 'MIF' models respectively. 
             Forces at each integrated location for history for the next 
             force evaluation.
-        quad_radii_curr : (Nasp,Nrad) numpy.ndarray
+        quad_radii_curr : (Nel,Nasp,Nrad) numpy.ndarray
             Quadrature radial positions for each asperity (rows) and discrete
             radial locations (columns). For 'TAN' model, it is saved here,
             but does not effect any results for any calculations.
@@ -297,7 +387,8 @@ class RoughContactFriction(NonlinearForce):
 
         """
         
-        self.unmax = np.maximum(uxyn[-1], self.unmax)
+        self.unmax = np.maximum(np.reshape(uxyn, (self.Nel, 3))[:, -1], 
+                                self.unmax)
         self.Fm_prev = Fm_curr
         self.fxy0 = fxy_curr
         self.uxyn0 = uxyn
@@ -377,6 +468,8 @@ class RoughContactFriction(NonlinearForce):
         dFdX : (N,N) numpy.ndarray
             Derivatives of forces `F` with respect to displacements `X`.
         aux : Tuple of extra results includes (Fm_prev, deltabar, Rebar, a)
+                If `Nel > 1`, each entry has an additional leading axis
+                for the elements.
         
                 Fm_prev : (Nasp,) numpy.ndarray
                     Maximum normal force for each asperity at the current
@@ -413,8 +506,17 @@ class RoughContactFriction(NonlinearForce):
         """
         uxyn = self.Q @ X
         
+        if self.use_pmap:
+            static_force_grad = _static_force_grad_pmap
+        else:
+            static_force_grad = _static_force_grad_vmap
+        
         # Local Force evaluation based on unl
-        dfnldunl, fnl, aux = _static_force_grad(uxyn, self.uxyn0, self.fxy0, 
+        dfnldunl, fnl, aux = static_force_grad(
+                                            np.reshape(uxyn, (self.Nel, 3)), 
+                                            np.reshape(self.uxyn0, 
+                                                       (self.Nel, 3)), 
+                                            self.fxy0, 
                                             self.unmax, self.Fm_prev, 
                                             self.mu, self.meso_gap, 
                                             self.gaps, self.gap_weights, 
@@ -426,21 +528,25 @@ class RoughContactFriction(NonlinearForce):
                                             self.elastic_mod, 
                                             self.tangent_mod, self.delta_y, 
                                             self.sys, self.Gstar,
-                                            tangent_model=self.tangent_model)
+                                            self.tangent_model)
         
         Fm_curr = aux[1]
         fxy_curr = aux[2]
         quad_radii_curr = aux[6]
         
         # Convert Back to Physical
-        F = self.T @ fnl
+        F, dFdX = _static_force_to_global(fnl, dfnldunl, self.T, self.Q)
         
-        dFdX = self.T @ dfnldunl @ self.Q
+        F = np.asarray(F)
+        dFdX = np.asarray(dFdX)
         
         if update_hist:
             self.update_history(uxyn, Fm_curr, fxy_curr, quad_radii_curr)
             
         if return_aux:
+            if self.Nel == 1:
+                return F, dFdX, tuple(a[0] for a in aux[1:])
+            
             return F, dFdX, aux[1:]
             
         else:
@@ -454,10 +560,10 @@ class RoughContactFriction(NonlinearForce):
 
         Parameters
         ----------
-        unlt : (Nt, 3) numpy.ndarray
+        unlt : (Nt, 3*Nel) numpy.ndarray
             Local displacements, rows are different time instants and
             columns are different displacement DOFs.
-        unltdot : (Nt, 3) numpy.ndarray
+        unltdot : (Nt, 3*Nel) numpy.ndarray
             Ignored here, included for compatibility of interface.
             Local velocities, rows are different time instants and
             columns are different displacement DOFs.
@@ -470,10 +576,9 @@ class RoughContactFriction(NonlinearForce):
             Evaluation of each harmonic component (columns) at a given instant
             in time (row = instant in time). These are without any harmonic
             coefficients, so are just cosine and sine evaluations.
-        unlth0 : (3,) numpy.ndarray
-            Ignored here, included for compatibility of interface.
-            Zeroth harmonic contributions to a time series of displacements.
-            Use `set_aft_initialize` instead.
+        unlth0 : (3*Nel,) numpy.ndarray
+            Initial displacements for the sliders.
+            Generally, pass `self.u0` as set by `set_aft_initialize`.
         max_repeats : int, optional
             Number of cycles of force evaluations to calculate.
             The default is 2.
@@ -484,7 +589,7 @@ class RoughContactFriction(NonlinearForce):
 
         Returns
         -------
-        fxyn_t : Tuple of (Nt, 3) numpy.ndarray
+        fxyn_t : Tuple of (Nt, 3*Nel) numpy.ndarray
             Force history for the element. Returned as tuple.
             Local nonlinear forces. First index is time instants, second index
             is which local nonlinear force DOF. This is returned as the first
@@ -502,15 +607,29 @@ class RoughContactFriction(NonlinearForce):
 
         """
         
-        fxyn_t = _local_force_history(unlt, unlth0, 
+        Nt = unlt.shape[0]
+        
+        # Rearrange to be (Nel, Nt, 3)
+        unlt_el = jnp.transpose(jnp.reshape(unlt, (Nt, self.Nel, 3)), 
+                                (1, 0, 2))
+        
+        if self.use_pmap:
+            force_history = _local_force_history_pmap
+        else:
+            force_history = _local_force_history_vmap
+        
+        fxyn_t = force_history(unlt_el, 
+                                    jnp.reshape(unlth0, (self.Nel, 3)), 
                                     self.mu, self.meso_gap, self.gaps, 
                                     self.gap_weights,
                                     self.quad_radii, self.weight_radii, 
                                     self.Re, self.poisson, 
                                     self.Estar, self.elastic_mod, self.tangent_mod, 
                                     self.delta_y, self.sys, self.Gstar, 
-                                    repeats=max_repeats, 
-                                    tangent_model=self.tangent_model)
+                                    max_repeats, self.tangent_model)
+        
+        fxyn_t = jnp.reshape(jnp.transpose(fxyn_t, (1, 0, 2)), 
+                             (Nt, 3*self.Nel))
         
         # typical return statement also requires derivatives, but this is just
         # for external processing and AFT will use the private function
@@ -572,19 +691,13 @@ class RoughContactFriction(NonlinearForce):
         converge
         to steady-state with two cycles of the hysteresis loop.
         `max_repeats` is followed if more cycles are desired.
+        
+        If `return_local=True`, the local forces are returned as a 
+        `(3*Nel, Nhc)` array. 
+        When `Nel > 1`, the local Jacobians are returned with a leading axis
+        for the elements as `(Nel, 3*Nhc, 3*Nhc)` and `(Nel, 3*Nhc)` arrays.
 
-        A numpy `kron` operation is utilized to convert forces back to physical
-        domain. This operation may result in many unnecessary calculations that
-        could be eliminated to speed up AFT.
         """
-        #########################
-        # Memory Initialization 
-        
-        Fnl = np.zeros_like(U)
-        if calc_grad:
-            dFnldU = np.zeros((U.shape[0], U.shape[0]))
-            dFnldw = np.zeros_like(U)
-        
         
         #########################
         # Transform to Local Coordinates
@@ -593,61 +706,91 @@ class RoughContactFriction(NonlinearForce):
         Ulocal = (self.Q @ np.reshape(U, (self.Q.shape[1], Nhc), 'F')).T
         
         # Number of Nonlinear DOFs
-        Ndnl = self.Q.shape[0]
+        Nel = self.Nel
         
         
         #########################
         # Conduct AFT in Local Coordinates with JAX
-        Uwlocal = np.hstack((np.reshape(Ulocal.T, (Ndnl*Nhc,), 'F'), w))
+        
+        # Each row is all harmonic components of an element (harmonic major
+        # order) followed by the frequency
+        Uwlocal = np.hstack((np.reshape(np.transpose(
+                                np.reshape(Ulocal, (Nhc, Nel, 3)), (1, 0, 2)), 
+                                        (Nel, 3*Nhc)), 
+                             w*np.ones((Nel, 1))))
+        
+        u0 = np.reshape(self.u0, (Nel, 3))
+        
+        if self.use_pmap:
+            local_aft_grad = _local_aft_grad_pmap
+            local_aft = _local_aft_pmap
+        else:
+            local_aft_grad = _local_aft_grad_vmap
+            local_aft = _local_aft_vmap
         
         if calc_grad:
             # Case with gradient and local force
-            dFdUwlocal, Flocal = _local_aft_grad(Uwlocal, self.u0, 
+            dFdUwlocal, Flocal = local_aft_grad(Uwlocal, u0, 
                                     self.mu, self.meso_gap, self.gaps, 
                                     self.gap_weights,
                                     self.quad_radii, self.weight_radii, 
                                     self.Re, self.poisson, 
                                     self.Estar, self.elastic_mod, self.tangent_mod, 
                                     self.delta_y, self.sys, self.Gstar, 
-                                    tuple(h), Nt, repeats=max_repeats,
-                                    tangent_model=self.tangent_model)
+                                    tuple(h), Nt, max_repeats,
+                                    self.tangent_model)
         else:
-            Flocal,_ = _local_aft(Uwlocal, self.u0, 
+            Flocal,_ = local_aft(Uwlocal, u0, 
                                     self.mu, self.meso_gap, self.gaps, 
                                     self.gap_weights,
                                     self.quad_radii, self.weight_radii, 
                                     self.Re, self.poisson, 
                                     self.Estar, self.elastic_mod, self.tangent_mod, 
                                     self.delta_y, self.sys, self.Gstar, 
-                                    tuple(h), Nt, repeats=max_repeats,
-                                    tangent_model=self.tangent_model)
+                                    tuple(h), Nt, max_repeats,
+                                    self.tangent_model)
+        
+        # Reshape Flocal to (Nel, Nhc, 3)
+        Flocal = jnp.reshape(Flocal, (Nel, Nhc, 3))
         
         #########################
         # Option to return local results
         
-        # Reshape Flocal
-        Flocal = jnp.reshape(Flocal, (Ndnl, Nhc), 'F')
-        
         if return_local:
             
-            if calc_grad:
-                return Flocal, dFdUwlocal[:, :-1], dFdUwlocal[:, -1]
+            Flocal = jnp.reshape(jnp.transpose(Flocal, (0, 2, 1)), 
+                                 (3*Nel, Nhc))
+            
+            if calc_grad and Nel == 1:
+                return Flocal, dFdUwlocal[0, :, :-1], dFdUwlocal[0, :, -1]
+            elif calc_grad:
+                return Flocal, dFdUwlocal[:, :, :-1], dFdUwlocal[:, :, -1]
             else:
                 return (Flocal,)
         
         #########################
         # Convert AFT to Global Coordinates
-                
-        # Global coordinates        
-        Fnl = np.reshape(self.T @ Flocal, (U.shape[0],), 'F')
+        
+        T3 = np.reshape(self.T, (self.T.shape[0], Nel, 3))
+        
+        # Global coordinates
+        Fnl = np.reshape(np.einsum('ned,ehd->hn', T3, Flocal), (U.shape[0],))
         
         if calc_grad:
-            dFnldU = np.kron(np.eye(Nhc), self.T) @ dFdUwlocal[:, :-1] \
-                                                @ np.kron(np.eye(Nhc), self.Q)
+            Q3 = np.reshape(self.Q, (Nel, 3, self.Q.shape[1]))
+            
+            # Local Jacobian as (Nel, Nhc, 3, Nhc, 3)
+            dFdUlocal = np.reshape(dFdUwlocal[:, :, :-1], 
+                                   (Nel, Nhc, 3, Nhc, 3))
+            
+            dFdwlocal = np.reshape(dFdUwlocal[:, :, -1], (Nel, Nhc, 3))
+            
+            dFnldU = np.reshape(np.einsum('ned,ehdkf,efm->hnkm', 
+                                          T3, dFdUlocal, Q3, optimize=True), 
+                                (U.shape[0], U.shape[0]))
         
-            dFnldw = np.reshape(self.T @ \
-                            np.reshape(dFdUwlocal[:, -1], (Ndnl, Nhc)), \
-                            (U.shape[0],), 'F')
+            dFnldw = np.reshape(np.einsum('ned,ehd->hn', T3, dFdwlocal), 
+                                (U.shape[0],))
             
             return Fnl, dFnldU, dFnldw
         else:
@@ -762,6 +905,48 @@ def _static_force(uxyn, uxyn0, fxy0, unmax, Fm_prev, mu,
     
     return fxyn, aux
 
+@jax.jit
+def _static_force_to_global(fnl, dfnldunl, T, Q):
+    """
+    Convert local static forces and Jacobians to global coordinates.
+
+    Parameters
+    ----------
+    fnl : (Nel, 3) jax.numpy.ndarray
+        Local forces for each element.
+    dfnldunl : (Nel, 3, 3) jax.numpy.ndarray
+        Local Jacobian for each element.
+    T : (N, 3*Nel) numpy.ndarray
+        Transformation from local forces to global forces.
+    Q : (3*Nel, N) numpy.ndarray
+        Transformation from global displacements to local displacements.
+
+    Returns
+    -------
+    F : (N,) jax.numpy.ndarray
+        Global forces.
+    dFdX : (N, N) jax.numpy.ndarray
+        Derivatives of `F` with respect to global displacements.
+        
+    Notes
+    -----
+    The block diagonal local Jacobian is applied to `T` element by element 
+    so only a single dense matrix product remains. 
+
+    """
+    
+    Nel = fnl.shape[0]
+    
+    T3 = jnp.reshape(T, (T.shape[0], Nel, 3))
+    
+    F = T @ jnp.reshape(fnl, (3*Nel,))
+    
+    TJ = jnp.einsum('ned,edf->nef', T3, dfnldunl)
+    
+    dFdX = jnp.reshape(TJ, (T.shape[0], 3*Nel)) @ Q
+    
+    return F, dFdX
+
 @partial(jax.jit, static_argnums=tuple(range(12, 21))) 
 def _static_force_grad(uxyn, uxyn0, fxy0, unmax, Fm_prev, mu, 
                        meso_gap, gaps, gap_weights,
@@ -795,40 +980,40 @@ def _static_force_grad(uxyn, uxyn0, fxy0, unmax, Fm_prev, mu,
 
 
 @partial(jax.jit, static_argnums=(10,)) 
-def _local_loop_body(ind, history, unlt, mu, meso_gap, gaps, gap_weights,
-                       Re, Estar, Gstar, tangent_model='TAN',
+def _local_loop_body(history, uxyn_curr, deltam, Fm, mu, gap_offsets, 
+                       gap_weights, Re, Estar, Gstar, tangent_model='TAN',
                        quad_radii_norm=0, weight_radii=0):
     """
     Calculation of total rough contact forces for a given instant in a time 
-    series. Formatted to allow for calling jax.lax.fori_loop
+    series. Formatted to allow for calling jax.lax.scan
     
     In general, considering the loop for Nt time points. 
     Considers Nasp=gaps.shape[0] asperities in contact for the element.
 
     Parameters
     ----------
-    ind : Time index to be calculated for this iteration
     history : Tuple of variables to use for history includes in order: 
-                fxyn_t : contact forces/tractions totalled over all asperities 
-                        for all time instants (Nt, 3)
                 uxyn0 : previous set of displacements (in general unlt[ind-1, :])
                             required so that initialization can be user defined
                 fxy0 : tangential force for each asperity at the previous 
                         instant shape (Nasp, 2) for 'TAN'.
                         For 'MIF' (Nasp, Nradius, 2)
-                deltam : Maximum normal displacement of each asperity for any 
-                        time (Nasp,)
-                Fm : Forces in the normal direction for instant of maximum 
-                        displacement
                 quad_radii0 : (Nasp, Nradius) numpy.ndarray
-                    Ignored for 'TAN' model, so can be anything. 
+                    Only included for 'MIF' model. 
                     Quadrature radii including maximum radius for 'MIF' 
                     model. Rows are asperities, columns are scaled radii
                     for each asperity. 
-    unlt : Time series of displacements for nonlinear force evaluations
-            Size (Nt, 3)
-    mu, meso_gap, gaps, gap_weights, Re, Estar, Gstar : 
+    uxyn_curr : Displacements for nonlinear force evaluations at the current 
+            instant. Size (3,)
+    deltam : Maximum normal displacement of each asperity for any 
+            time (Nasp,). Constant over the time loop.
+    Fm : Forces in the normal direction for instant of maximum 
+            displacement (Nasp,). Constant over the time loop.
+    mu, gap_weights, Re, Estar, Gstar : 
             See RoughContactFriction Class Documentation
+    gap_offsets : (Nasp,) 
+            Sum of `meso_gap` and `gaps` for the element. Precomputed 
+            outside of the time loop.
     tangent_model : {'TAN', 'MIF'}, optional
         Flag for tangent asperity model (stick-slip) or Mindlin-Iwan Fit model
         (microslip at each asperity).
@@ -845,46 +1030,48 @@ def _local_loop_body(ind, history, unlt, mu, meso_gap, gaps, gap_weights,
 
     Returns
     -------
-    history : Same as input, but updated for the instant ind
+    history : Same as input, but updated for the current instant
+    fxyn_curr : Contact forces/tractions totalled over all asperities 
+            for the current instant (3,)
 
     """
     
-    fxyn_t, uxyn0, fxy0, deltam, Fm, quad_radii0 = history
+    uxyn0, fxy0 = history[:2]
     
     # Asperity force calculation
     
     # Normal Direction forces, exclusively on the plastic unloading curve
     # Elastic Unloading after Plasticity
-    un = unlt[ind, 2] - meso_gap - gaps
+    un = uxyn_curr[2] - gap_offsets
     
     fn_curr, a, deltabar, Rebar = asp_funs._normal_asperity_unloading(un, 
                                                         deltam, Fm, Re, Estar)
     
     # Tangential Forces
     if tangent_model == 'TAN':
-        fxy_curr = asp_funs._tangential_asperity(unlt[ind, :2], uxyn0[:2], fxy0, 
+        fxy_curr = asp_funs._tangential_asperity(uxyn_curr[:2], uxyn0[:2], fxy0, 
                                              fn_curr, a, Gstar, mu)
         
         integrated_forces = gap_weights @ fxy_curr
         
-        # quadrature radii for contact are ignored with TAN model.
-        quad_radii_curr = quad_radii0
+        # quadrature radii for contact are not tracked with TAN model.
+        history = (uxyn_curr, fxy_curr)
     elif tangent_model == 'MIF':
+        quad_radii0 = history[2]
+        
         asp_fxy_curr, fxy_curr, quad_radii_curr \
-            = asp_funs._tangential_asperity_mif(unlt[ind, :2], 
+            = asp_funs._tangential_asperity_mif(uxyn_curr[:2], 
                                     uxyn0[:2], fxy0, fn_curr, a, Gstar, mu, 
                                     quad_radii0, quad_radii_norm, weight_radii)
         
         integrated_forces = gap_weights @ asp_fxy_curr
         
+        history = (uxyn_curr, fxy_curr, quad_radii_curr)
     
     # Integrate asperity forces into total element in contact forces
-    fxyn_t = fxyn_t.at[ind, :2].set(integrated_forces)
-    fxyn_t = fxyn_t.at[ind, -1].set(fn_curr @ gap_weights)
+    fxyn_curr = jnp.hstack((integrated_forces, fn_curr @ gap_weights))
     
-    history = (fxyn_t, unlt[ind, :], fxy_curr, deltam, Fm, quad_radii_curr)
-    
-    return history
+    return history, fxyn_curr
     
 
 @partial(jax.jit, static_argnums=tuple(range(8, 18))) 
@@ -941,7 +1128,6 @@ def _local_force_history(unlt, unlth0, mu, meso_gap, gaps, gap_weights,
     ###########
     # Generate a history tuple for use in the function
     uxyn0 = unlth0*1.0 # Previous instant of displacements (force to be double)
-    fxyn_t = jnp.zeros((Nt, 3)) # History of total contact forces (summed over asperities)
     # deltam = unmax_asp # Maximum normal displacement at each element
     # fm = fn # Normal asperity forces for maximum normal displacement
     
@@ -949,6 +1135,8 @@ def _local_force_history(unlt, unlth0, mu, meso_gap, gaps, gap_weights,
         # previous instant of asperity forces
         fxy0 = jnp.zeros((gap_weights.shape[0], 2))
         quad_radii_norm = quad_radii
+        
+        history = (uxyn0, fxy0)
     elif tangent_model == 'MIF':
         # Need quadrature radii to be made into different ones for each
         # asperity in contact, the input is non-dimensional radius.
@@ -958,27 +1146,29 @@ def _local_force_history(unlt, unlth0, mu, meso_gap, gaps, gap_weights,
         
         # Previous tractions, (Nasp, Nradius, 2)
         fxy0 = jnp.zeros((gaps.shape[0], weight_radii.shape[0], 2))
-    
-    history = (fxyn_t, uxyn0, fxy0, unmax_asp, fn, quad_radii)
+        
+        history = (uxyn0, fxy0, quad_radii)
     
     ###########
     # Loop body function
     
-    loop_fun = lambda i,hist : _local_loop_body(i, hist, unlt, mu, meso_gap, 
-                                            gaps, gap_weights, Re, Estar, Gstar,
+    gap_offsets = meso_gap + gaps
+    
+    # Maximum normal displacement and force do not change over the loop
+    loop_fun = lambda hist,u : _local_loop_body(hist, u, unmax_asp, fn, mu, 
+                                            gap_offsets, gap_weights, Re, Estar, Gstar,
                                             tangent_model=tangent_model,
                                             quad_radii_norm=quad_radii_norm,
                                             weight_radii=weight_radii)
     
     ###########
     # Do a loop over the set of Nt samples, repeating to get convergence 
-    # to steady-state forces
-    for i in range(repeats):
-        history = jax.lax.fori_loop(0, Nt, loop_fun, history)
+    # to steady-state forces. All repeats are done in a single scan over 
+    # stacked copies of the cycle and only the last repeat is kept.
+    history, fxyn_t = jax.lax.scan(loop_fun, history, 
+                                   jnp.tile(unlt, (repeats, 1)))
     
-    ###########
-    # Extract the steady-state forces
-    fxyn_t = history[0]
+    fxyn_t = fxyn_t[-Nt:, :]
 
     return fxyn_t
 
@@ -1006,7 +1196,7 @@ def _local_aft(Uwlocal, unlth0, mu, meso_gap, gaps, gap_weights,
     #
     # Ulocal is (Nhc x Ndnl) - each column is the harmonic components for a 
     # single nonlinear DOF.
-    Ulocal = jnp.reshape(Uwlocal[:-1], (Ndnl, Nhc), 'F').T
+    Ulocal = jnp.reshape(Uwlocal[:-1], (Nhc, Ndnl))
 
     ########################################
     #### Displacements
@@ -1027,8 +1217,8 @@ def _local_aft(Uwlocal, unlth0, mu, meso_gap, gaps, gap_weights,
     # Convert back into frequency domain
     Flocal = jhutils.get_fourier_coeff(htuple, ft)
     
-    # Flatten back to a 1D array
-    Flocal = jnp.reshape(Flocal.T, (-1,), 'F')
+    # Flatten back to a 1D array, row-major order lists each harmonic in full
+    Flocal = jnp.reshape(Flocal, (-1,))
     
     return Flocal,Flocal
 
@@ -1053,4 +1243,141 @@ def _local_aft_grad(Uwlocal, unlth0, mu, meso_gap, gaps, gap_weights,
     return J,F
 
 
+###############################################################################
+########## Vectorized Functions over Elements                        ##########
+###############################################################################
+
+# These functions evaluate the above functions for a leading axis of `Nel` 
+# elements on the element dependent inputs (displacements, history variables, 
+# and meso_gap). All other arguments are shared between the elements and 
+# must be passed positionally (including tangent_model).
+# 
+# The vectorized functions are also jit compiled with the same static 
+# arguments so that a single compiled function is cached and reused for all
+# calls (and all objects) with the same parameters and array shapes.
+# 
+# With `use_pmap=True` on `RoughContactFriction`, the elements are instead
+# split between the local JAX devices (e.g., CPU cores exposed with
+# XLA_FLAGS=--xla_force_host_platform_device_count=N) with pmap so that they
+# are evaluated in parallel. 
+
+def _element_map(fun, in_axes, static_argnums):
+    """
+    Create a function that evaluates `fun` for many elements.
+
+    Parameters
+    ----------
+    fun : function
+        Function for a single element.
+    in_axes : tuple
+        Entries are 0 for arguments with a leading element axis and None for
+        arguments shared between elements.
+    static_argnums : tuple
+        Static arguments of `fun` for jit compilation.
+
+    Returns
+    -------
+    mapped_fun : function
+        Function with same arguments as `fun`, but with a leading element 
+        axis on the inputs with `in_axes` of 0 and on all outputs.
+
+    """
+    
+    return jax.jit(jax.vmap(fun, in_axes=in_axes), 
+                   static_argnums=static_argnums)
+
+def _element_pmap(fun_vmap, in_axes, static_argnums):
+    """
+    Create a function that splits the elements between local JAX devices.
+
+    Parameters
+    ----------
+    fun_vmap : function
+        Function for many elements as returned by `_element_map`.
+    in_axes : tuple
+        Same as for `_element_map`.
+    static_argnums : tuple
+        Same as for `_element_map`.
+
+    Returns
+    -------
+    mapped_fun : function
+        Function with same arguments and outputs as `fun_vmap`. 
+        If there is only one local device, `fun_vmap` is called directly.
+
+    """
+    
+    fun_pmap = jax.pmap(fun_vmap, in_axes=in_axes, 
+                        static_broadcasted_argnums=static_argnums)
+    
+    mapped_inds = [ind for ind,axis in enumerate(in_axes) if axis == 0]
+    
+    def mapped_fun(*args):
+        
+        Nel = np.shape(args[0])[0]
+        Ndev = min(jax.local_device_count(), Nel)
+        
+        if Ndev == 1:
+            return fun_vmap(*args)
+        
+        # Pad by repeating the last element so each device has the same 
+        # number of elements, padded results are discarded.
+        Nper = -(-Nel // Ndev)
+        
+        # Arrays stay on the devices and are placed with the leading axis
+        # split between devices as pmap expects. 
+        mesh = jax.sharding.Mesh(np.array(jax.local_devices()[:Ndev]), ('el',))
+        sharding = jax.sharding.NamedSharding(mesh, 
+                                              jax.sharding.PartitionSpec('el'))
+        
+        args = list(args)
+        for ind in mapped_inds:
+            arr = jnp.asarray(args[ind])
+            arr = jnp.concatenate((arr, 
+                                   jnp.repeat(arr[-1:], Nper*Ndev - Nel, axis=0)))
+            
+            args[ind] = jax.device_put(
+                            jnp.reshape(arr, (Ndev, Nper) + arr.shape[1:]), 
+                            sharding)
+        
+        out = fun_pmap(*args)
+        
+        return jax.tree_util.tree_map(
+                    lambda x : jnp.reshape(x, (Ndev*Nper,) + x.shape[2:])[:Nel],
+                    out)
+        
+    return mapped_fun
+
+_static_force_grad_vmap = _element_map(_static_force_grad, 
+                                       (0, 0, 0, 0, 0, None, 0, None, None, 
+                                        0) + (None,)*11, 
+                                       tuple(range(12, 21)))
+
+_local_force_history_vmap = _element_map(_local_force_history, 
+                                         (0, 0, None, 0) + (None,)*14, 
+                                         tuple(range(8, 18)))
+
+_local_aft_vmap = _element_map(_local_aft, 
+                               (0, 0, None, 0) + (None,)*16, 
+                               tuple(range(8, 20)))
+
+_local_aft_grad_vmap = _element_map(_local_aft_grad, 
+                                    (0, 0, None, 0) + (None,)*16, 
+                                    tuple(range(8, 20)))
+
+_static_force_grad_pmap = _element_pmap(_static_force_grad_vmap, 
+                                        (0, 0, 0, 0, 0, None, 0, None, None, 
+                                         0) + (None,)*11, 
+                                        tuple(range(12, 21)))
+
+_local_force_history_pmap = _element_pmap(_local_force_history_vmap, 
+                                          (0, 0, None, 0) + (None,)*14, 
+                                          tuple(range(8, 18)))
+
+_local_aft_pmap = _element_pmap(_local_aft_vmap, 
+                                (0, 0, None, 0) + (None,)*16, 
+                                tuple(range(8, 20)))
 
+_local_aft_grad_pmap = _element_pmap(_local_aft_grad_vmap, 
+                                     (0, 0, None, 0) + (None,)*16, 
+                                     tuple(range(8, 20)))
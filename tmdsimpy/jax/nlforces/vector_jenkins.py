@@ -74,7 +74,7 @@ class VectorJenkins(NonlinearForce):
         
         self.u0 = u0
         
-    def aft(self, U, w, h, Nt=128, tol=1e-7):
+    def aft(self, U, w, h, Nt=128, tol=1e-7, calc_grad=True):
         """
         Implementation of the alternating frequency-time (AFT) method to
         extract harmonic nonlinear force coefficients.
@@ -95,6 +95,10 @@ class VectorJenkins(NonlinearForce):
             This argument is ignored, and is included for compatability of 
             interface. 
             The default is 1e-7.
+        calc_grad : boolean
+            Flag where True indicates that the gradients should be calculated 
+            and returned. If False, then returns only (Fnl,) as a tuple. 
+            The default is True
         
         Returns
         -------
@@ -114,14 +118,6 @@ class VectorJenkins(NonlinearForce):
 
         """
         
-        #########################
-        # Memory Initialization 
-        
-        Fnl = np.zeros_like(U)
-        dFnldU = np.zeros((U.shape[0], U.shape[0]))
-        dFnldw = np.zeros_like(U)
-        
-        
         #########################
         # Transform to Local Coordinates
         
@@ -146,16 +142,19 @@ class VectorJenkins(NonlinearForce):
         
         #########################
         # Conduct AFT in Local Coordinates with JAX
-        Uwlocal = np.hstack((np.reshape(Ulocal.T, (Ndnl*Nhc,), 'F'), w))
+        # Jenkins is rate independent, so frequency is not passed to JAX.
+        Ulocal_flat = np.reshape(Ulocal.T, (Ndnl*Nhc,), 'F')
         
         pars = np.array([self.kt, self.Fs])
         
-        # # If no Grad is needed use:
-        # Flocal = _local_aft_jenkins(Uwlocal, pars, u0, tuple(h), Nt, u0h0)[0]
-        
-        # Case with gradient and local force
-        dFdUwlocal, Flocal = _local_aft_jenkins_grad(Uwlocal, pars, u0, \
-                                                     tuple(h), Nt, u0h0)
+        if calc_grad:
+            # Case with gradient and local force
+            dFdUlocal, Flocal = _local_aft_jenkins_grad(Ulocal_flat, pars, u0, \
+                                                        tuple(h), Nt, u0h0)
+        else:
+            # Forward evaluation only, skips the tangents of jacfwd
+            Flocal,_ = _local_aft_jenkins(Ulocal_flat, pars, u0, \
+                                          tuple(h), Nt, u0h0)
         
         
         #########################
@@ -166,73 +165,20 @@ class VectorJenkins(NonlinearForce):
                 
         # Global coordinates        
         Fnl = np.reshape(self.T @ Flocal, (U.shape[0],), 'F')
-        dFnldU = np.kron(np.eye(Nhc), self.T) @ dFdUwlocal[:, :-1] \
-                                                @ np.kron(np.eye(Nhc), self.Q)
-        
-        dFnldw = np.reshape(self.T @ \
-                            np.reshape(dFdUwlocal[:, -1], (Ndnl, Nhc)), \
-                            (U.shape[0],), 'F')
         
-        return Fnl, dFnldU, dFnldw
+        if calc_grad:
+            dFnldU = self._jacobian_to_global(dFdUlocal, Nhc)
+            
+            # Rate independent force
+            dFnldw = np.zeros_like(U)
+            
+            return Fnl, dFnldU, dFnldw
+        else:
+            return (Fnl,)
         
 
-def _local_jenkins_loop_body(ind, ft, unlt, kt, Fs):
-    """
-    Function for calculating a single force update for Jenkins. This is
-    constructed as a loop body function for JAX and thus evaluates for a 
-    specific index given the full arrays for the force and displacement 
-    time series.
-
-    Parameters
-    ----------
-    ind : Index that is being updated for this loop step.
-    ft : Array of force values for all time (Nt,)
-    unlt : Displacements for Jenkins for all times (Nt,)
-    kt : Tangential stiffness parameter
-    Fs : Slip Force parameter
-
-    Returns
-    -------
-    ft : Force array with the entry at ind updated for Jenkins nonlinear force
-
-    """
-    
-    fcurr = jnp.minimum(kt*(unlt[ind, :]-unlt[ind-1, :]) + ft[ind-1, :], Fs)
-    
-    ft = ft.at[ind, :].set(jnp.maximum(fcurr, -Fs))
-    
-    return ft
- 
-def _local_jenkins_loop_body_crit(ind, ft, unlt, kt, Fs, crit):
-    """
-    Function for calculating a single force update for Jenkins. This is
-    constructed as a loop body function for JAX and thus evaluates for a 
-    specific index given the full arrays for the force and displacement 
-    time series.
-
-    Parameters
-    ----------
-    ind : Index that is being updated for this loop step.
-    ft : Array of force values for all time (Nt,)
-    unlt : Displacements for Jenkins for all times (Nt,)
-    kt : Tangential stiffness parameter
-    Fs : Slip Force parameter
-    crit : index of the critical point to always use as history variable
-
-    Returns
-    -------
-    ft : Force array with the entry at ind updated for Jenkins nonlinear force
-
-    """
-    
-    fcurr = jnp.minimum(kt*(unlt[ind, :]-unlt[crit, :]) + ft[crit, :], Fs)
-    
-    ft = ft.at[ind, :].set(jnp.maximum(fcurr, -Fs))
-    
-    return ft
-
 @partial(jax.jit, static_argnums=(3,4,5)) 
-def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
+def _local_aft_jenkins(Ulocal_flat, pars, u0, htuple, Nt, u0h0):
     """
     Conducts AFT in a functional form that can be used with JAX and JIT
 
@@ -246,9 +192,9 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
 
     Parameters
     ----------
-    Uwlocal : jax.numpy array with displacements at local nonlinear DOFs 
-                followed by frequency. Each harmonic is listed in full
-                then the next harmonic ect. Size (Nhc*Ndnl + 1,)
+    Ulocal_flat : jax.numpy array with displacements at local nonlinear DOFs.
+                Each harmonic is listed in full then the next harmonic ect. 
+                Size (Nhc*Ndnl,)
     pars : jax.numpy array with parameters [kt, Fs]. Bundled this way in case
             future work is interested in applying autodiff w.r.t. parameters
     u0 : scalar value for the displacement to initialize the slider to
@@ -263,7 +209,7 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     Returns
     -------
     Flocal : Nhc*Ndl array of the harmonic force coefficients locally. 
-             Same format as U part of Uwlocal 
+             Same format as Ulocal_flat 
     Flocal : Flocal is returned again as aux data so it can be accessed when
                 gradient is calculated with JAX
 
@@ -274,19 +220,19 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     
     # Size Calculation
     Nhc = hutils.Nhc(np.array(htuple))
-    Ndnl = int(Uwlocal.shape[0] / Nhc)
+    Ndnl = int(Ulocal_flat.shape[0] / Nhc)
     
     # Recover pars for convenience
     kt = pars[0]
     Fs = pars[1]
     
-    # Uwlocal is arranged as all of harmonic 0, then all of 1c, etc. 
-    # For each harmonic it has the DOFs in order. Finally there is frequency.
+    # Ulocal_flat is arranged as all of harmonic 0, then all of 1c, etc. 
+    # For each harmonic it has the DOFs in order.
     # This is a 1d array. 
     #
     # Ulocal is (Nhc x Ndnl) - each column is the harmonic components for a 
     # single nonlinear DOF.
-    Ulocal = jnp.reshape(Uwlocal[:-1], (Ndnl, Nhc), 'F').T
+    Ulocal = jnp.reshape(Ulocal_flat, (Nhc, Ndnl))
 
     
     ########################################
@@ -296,13 +242,10 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     # Nt x Ndnl
     unlt = jhutils.time_series_deriv(Nt, htuple, Ulocal, 0) # Nt x Ndnl
     
-    # Do not need velocity for Jenkins, this is how it would be calculated:
+    # Do not need velocity for Jenkins, this is how it would be calculated
+    # if frequency w were also passed in:
     # # Nt x Ndnl
-    # unltdot = Uwlocal[-1]*jhutils.time_series_deriv(Nt, htuple, Ulocal, 1) 
-    
-    # Initialize force time memory
-    ft = jnp.zeros_like(unlt)
-    
+    # unltdot = w*jhutils.time_series_deriv(Nt, htuple, Ulocal, 1) 
     
     
     ########################################
@@ -313,6 +256,13 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     dun = jnp.roll(unlt, -1, axis=0) - unlt # du to next
     
     vector_set = jnp.not_equal(jnp.sign(dup), jnp.sign(dun))
+
+    # A peak between two samples gives two equal samples that would both be
+    # flagged. Only the first is kept so that a duplicate does not use up the
+    # budget of critical points and push out a real reversal. Every instant
+    # after a critical point must be monotonic for the vectorized fill below.
+    vector_set = jnp.logical_and(vector_set, jnp.not_equal(dup, 0.0))
+
     vector_set = vector_set.at[0].set(True) # This makes it much easier to write the loop below and is assumed.
     
     # Maximum number of critical points is 2*(Hmax)
@@ -329,9 +279,14 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     
     #### Start Slider in correct position for subset
     
-    u0 = jnp.where(u0h0, Ulocal[0, 0:1], u0)
+    u0 = Ulocal[0, 0:1] if u0h0 else u0
+    
+    # Only the critical points are gathered and updated, so the loop does
+    # not scatter into the full (Nt, Ndnl) force history. 
+    ucrit = unlt[inds, :]
     
-    ft = ft.at[inds[-1], :].set(kt*(unlt[inds[-1], :] - u0))
+    fcrit = [None]*Ncrit
+    fcrit[-1] = kt*(ucrit[-1, :] - u0)
     
     #### Do loop
     # If there are a lot of harmonics, one may want to use a lax loop
@@ -340,15 +295,13 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     for outer in range(2):
         for cind in range(Ncrit):
             
-            fcurr = jnp.minimum(kt*(unlt[inds[cind], :]-unlt[inds[cind-1], :]) \
-                                + ft[inds[cind-1], :], Fs)
-            
-            ft = ft.at[inds[cind], :].set(jnp.maximum(fcurr, -Fs))
-            
-    inds = jnp.hstack((inds, np.array([Nt])))
+            fcrit[cind] = jnp.clip(kt*(ucrit[cind, :]-ucrit[cind-1, :]) \
+                                   + fcrit[cind-1], -Fs, Fs)
+    
+    fcrit = jnp.stack(fcrit)
             
     ########################################
-    #### Special Loop w/ vectorized for filling in between critical points
+    #### Vectorized fill in between critical points
     
     # Options here
     
@@ -357,58 +310,49 @@ def _local_aft_jenkins(Uwlocal, pars, u0, htuple, Nt, u0h0):
     # because the indices are dynamic and it is a JIT function. 
     
     # 2.
-    # Alternatively full matrices of ftprev and a rotated unlt could be 
-    # constructed based on the critical indices to do everything in one vector 
-    # operation. Such an approach adds computations and memory requirements, 
-    # so is not considered.
+    # Between critical points the motion is monotonic, so each force only 
+    # depends on the most recent critical point. Gathering that point for 
+    # every time instant allows everything to be done in one vector operation
+    # with only (Nt,) extra memory. This approach is adopted.
     
     # 3.
     # Run the same loop as the normal jax jenkins, but only once. 
-    # This approach is adopted since it is the simplest and lowest memory.
+    # This was the previous approach, but it is a serial loop over all Nt 
+    # time instants.
     
-    # Do a loop function for each update at index i
-    loop_fun = lambda i,f : _local_jenkins_loop_body(i, f, unlt, kt, Fs)
+    # Index of the most recent critical point at or before each time instant
+    time_inds = jnp.arange(Nt)
     
-    # save a single computation since know that index 0 was chosen as a critical
-    # point for convenience in indexing
-    ft = jax.lax.fori_loop(1, Nt, loop_fun, ft)
+    is_crit = jnp.zeros(Nt, dtype=bool).at[inds].set(True)
     
-    # 4. 
-    # Run a set of individual loops between critical points to fill in the 
-    # center. Hopefully LAX will realize they can be vectorized.
-    # This is a rough outline of how 4 would be implemented, but fails the test
-    # Also, quick timing indicates this isn't really any faster than option 3. 
+    prev = jax.lax.cummax(jnp.where(is_crit, time_inds, 0))
+    
+    # Critical point forces are placed with a single scatter 
+    ft = jnp.zeros_like(unlt).at[inds, :].set(fcrit)
+    
+    ft = jnp.clip(kt*(unlt - unlt[prev, :]) + ft[prev, :], -Fs, Fs)
     
-    # for i in range( len(inds)-1 ):
-    #     start = inds[i]+1
-    #     stop  = inds[i+1] # want to end on the previous index (e.g., this minus 1)
-        
-    #     crit_loop_fun = lambda i,f : _local_jenkins_loop_body_crit(i, f, unlt, kt, Fs, inds[i])
-        
-    #     ft = jax.lax.fori_loop(start, stop, crit_loop_fun, ft)
-        
-
     ########################################
     #### Final Conversions
     
     # Convert back into frequency domain
     Flocal = jhutils.get_fourier_coeff(htuple, ft)
     
-    # Flatten back to a 1D array
-    Flocal = jnp.reshape(Flocal.T, (-1,), 'F')
+    # Flatten back to a 1D array, row-major order lists each harmonic in full
+    Flocal = jnp.reshape(Flocal, (-1,))
     
     return Flocal,Flocal
         
 
 @partial(jax.jit, static_argnums=(3,4,5)) 
-def _local_aft_jenkins_grad(Uwlocal, pars, u0, htuple, Nt, u0h0):
+def _local_aft_jenkins_grad(Ulocal_flat, pars, u0, htuple, Nt, u0h0):
     """
     Function that computes the gradient of AFT. Using Aux data allows for 
     returning Flocal also from one function call. 
 
     Parameters
     ----------
-    Uwlocal : Displacements and frequency as defined for _local_aft_jenkins
+    Ulocal_flat : Displacements as defined for _local_aft_jenkins
     pars : Parameters as defined for _local_aft_jenkins
     u0 : scalar value for the displacement to initialize the slider to
     htuple : List of harmonics, tuple, use tuple(h) so can be set to static.
@@ -419,12 +363,12 @@ def _local_aft_jenkins_grad(Uwlocal, pars, u0, htuple, Nt, u0h0):
 
     Returns
     -------
-    J : Jacobian of _local_aft_jenkins w.r.t. Uwlocal
+    J : Jacobian of _local_aft_jenkins w.r.t. Ulocal_flat
     F : Normal output argument (nonlinear force) of _local_aft_jenkins
 
     """
     
-    J,F = jax.jacfwd(_local_aft_jenkins, has_aux=True)(Uwlocal, pars, u0, 
+    J,F = jax.jacfwd(_local_aft_jenkins, has_aux=True)(Ulocal_flat, pars, u0, 
                                                        htuple, Nt, u0h0)
     
     return J,F
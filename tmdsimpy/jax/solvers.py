@@ -576,6 +576,12 @@ class NonlinearSolverOMP(NonlinearSolver):
         rate_r = np.nan
         rate_e = np.nan
         rate_u = np.nan
+        
+        # BFGS low rank update storage, allocated once per solve. 
+        # Columns are overwritten before they are used after each NR step.
+        bfgs_s = np.zeros((X.shape[0], self.config['reform_freq']-1))
+        bfgs_y = np.zeros((X.shape[0], self.config['reform_freq']-1))
+        bfgs_p = np.zeros((self.config['reform_freq']-1))
             
         ##########################################################
         # Iteration Loop
@@ -605,10 +611,6 @@ class NonlinearSolverOMP(NonlinearSolver):
                 
                 deltaX = -self.lin_factored_solve(factored_data, R)
                 
-                bfgs_s = np.zeros((X.shape[0], self.config['reform_freq']-1))
-                bfgs_y = np.zeros((X.shape[0], self.config['reform_freq']-1))
-                bfgs_p = np.zeros((self.config['reform_freq']-1))
-                
             else: # BFGS Update        
                 curr_iter = 'BFGS'
                 
@@ -788,9 +790,9 @@ def _check_convg(check_list, tol_dict, r_curr, e_curr, u_curr, r_rel, e_rel, u_r
                 'xtol'    : u_curr, 
                 'rtol'    : r_curr,
                 'etol'    : e_curr,
-                'xtol_rel' : e_rel,
+                'xtol_rel' : u_rel,
                 'rtol_rel' : r_rel,
-                'etol_rel' : u_rel,
+                'etol_rel' : e_rel,
                 }
     
     for key in check_list:
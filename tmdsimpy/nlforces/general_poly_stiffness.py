@@ -219,8 +219,6 @@ class GenPolyForce(InstantaneousForce):
         that the nonlinear force is evaluated at. 
         """
         
-        Fnl = np.zeros_like(U)
-        dFnldU = np.zeros((U.shape[0], U.shape[0]))
         dFnldw = np.zeros_like(U)
          
         Nhc = 2*(h !=0).sum() + (h==0).sum() # Number of Harmonic Components        
@@ -265,7 +263,7 @@ class GenPolyForce(InstantaneousForce):
                 J[di::Ndnl, dj::Ndnl] = dFdUnl[:, di, dj, :]
         
         Fnl = np.reshape(self.T @ F.T, (U.shape[0],), 'F')
-        dFnldU = np.kron(np.eye(Nhc), self.T) @ J @ np.kron(np.eye(Nhc), self.Q)
+        dFnldU = self._jacobian_to_global(J, Nhc)
         dFnldw = np.reshape(dFnldw, (U.shape[0],), 'F')
       
         return Fnl, dFnldU, dFnldw
\ No newline at end of file
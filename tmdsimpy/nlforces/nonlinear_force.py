@@ -107,6 +107,44 @@ class NonlinearForce:
         
         return Fnl, dFnldU, dFnldw
     
+    def _jacobian_to_global(self, J, Nhc):
+        """
+        Transform a harmonic Jacobian from local to global coordinates.
+        
+        Parameters
+        ----------
+        J : (Nnl*Nhc, Nnl*Nhc) numpy.ndarray
+            Jacobian of local harmonic forces with respect to local harmonic
+            displacements. Consecutive sets of `Nnl` rows and columns 
+            correspond to each harmonic component.
+        Nhc : int
+            Number of harmonic components.
+        
+        Returns
+        -------
+        dFnldU : (N*Nhc, N*Nhc) numpy.ndarray
+            Jacobian of global harmonic forces with respect to global 
+            harmonic displacements.
+        
+        Notes
+        -----
+        This is equivalent to 
+        `np.kron(np.eye(Nhc), T) @ J @ np.kron(np.eye(Nhc), Q)`, 
+        but applies `T` and `Q` to each harmonic block instead of forming
+        the block diagonal matrices.
+        
+        """
+        
+        Nnl, N = self.Q.shape
+        
+        # Blocks indexed as [row harmonic, column harmonic, :, :] so that
+        # matmul broadcasts the transforms over all harmonic pairs
+        J = np.reshape(J, (Nhc, Nnl, Nhc, Nnl)).transpose(0, 2, 1, 3)
+        
+        dFnldU = (self.T @ J @ self.Q).transpose(0, 2, 1, 3)
+        
+        return np.reshape(dFnldU, (N*Nhc, N*Nhc))
+    
 class InstantaneousForce(NonlinearForce):
     """ 
     Template class for instantaneous nonlinear forces. 
@@ -245,8 +283,6 @@ class InstantaneousForce(NonlinearForce):
         that the nonlinear force is evaluated at. 
         """
         
-        Fnl = np.zeros_like(U)
-        dFnldU = np.zeros((U.shape[0], U.shape[0]))
         dFnldw = np.zeros_like(U)
         
         Nhc = 2*(h !=0).sum() + (h==0).sum() # Number of Harmonic Components        
@@ -292,8 +328,7 @@ class InstantaneousForce(NonlinearForce):
         
         # Convert to Global Coordinates
         Fnl = np.reshape(self.T @ F.T, (U.shape[0],), 'F')
-        dFnldU = np.kron(np.eye(Nhc), self.T) @ J \
-                 @ np.kron(np.eye(Nhc), self.Q)
+        dFnldU = self._jacobian_to_global(J, Nhc)
         
         if not (w == 0):
             # Derivative of force w.r.t. frequency
@@ -610,8 +645,6 @@ class HystereticForce(NonlinearForce):
         that the nonlinear force is evaluated at. 
         """
         
-        Fnl = np.zeros_like(U)
-        dFnldU = np.zeros((U.shape[0], U.shape[0]))
         dFnldw = np.zeros_like(U)
         
         Nhc = 2*(h !=0).sum() + (h==0).sum() # Number of Harmonic Components        
@@ -656,8 +689,7 @@ class HystereticForce(NonlinearForce):
         
         Fnl = np.reshape(self.T @ F.T, (U.shape[0],), 'F')
         
-        dFnldU = np.kron(np.eye(Nhc), self.T) @ J \
-                    @ np.kron(np.eye(Nhc), self.Q)
+        dFnldU = self._jacobian_to_global(J, Nhc)
         
         dFnldw = np.reshape(dFnldw, (U.shape[0],), 'F')
         
@@ -65,23 +65,28 @@ def local_harmonic_forces(vibration_system, U, w, h, Nt=128, aft_tol=1e-7):
     
     Uh_ut_Fh_ft = [None] * len(vibration_system.nonlinear_forces)
     
+    # Cosine/sine time series of each harmonic and their derivatives, 
+    # shared by all forces
+    cst = hutils.time_series_deriv(Nt, h, np.eye(Nhc), 0)
+    cst_dot = hutils.time_series_deriv(Nt, h, np.eye(Nhc), 1)
+    
     # Repeat AFT to return local information
     for ind, nlforce in enumerate(vibration_system.nonlinear_forces):
         
         # Local harmonic forces
         Uh = (nlforce.Q @ np.reshape(U, (nlforce.Q.shape[1], Nhc), 'F')).T
         
-        ut = hutils.time_series_deriv(Nt, h, Uh, 0) # Nt x Ndnl
-        unltdot = w*hutils.time_series_deriv(Nt, h, Uh, 1) # Nt x Ndnl
+        ut = cst @ Uh # Nt x Ndnl
+        unltdot = w*(cst_dot @ Uh) # Nt x Ndnl
         
-        cst = hutils.time_series_deriv(Nt, h, np.eye(Nhc), 0)
+        force_type = nlforce.nl_force_type()
         
-        if nlforce.nl_force_type() == 0:
+        if force_type == 0:
             # Instantaneous Nonlinearities
             
             ft = nlforce.local_force_history(ut, unltdot)[0]
         
-        if nlforce.nl_force_type() == 1:
+        elif force_type == 1:
             # Hysteretic Nonlinearities
             
             if hasattr(nlforce, 'u0'):
@@ -96,6 +101,13 @@ def local_harmonic_forces(vibration_system, U, w, h, Nt=128, aft_tol=1e-7):
             ft = nlforce.local_force_history(ut, unltdot, h, cst, unlth0, 
                                                        atol=aft_tol)[0]
         
+        Uh_ut_Fh_ft[ind] = (Uh, ut, ft)
+        
+    # Fourier coefficients after all force histories have been started, so 
+    # asynchronously dispatched (JAX) force histories are not waited on 
+    # before the next force is evaluated.
+    for ind, (Uh, ut, ft) in enumerate(Uh_ut_Fh_ft):
+        
         Fh = hutils.get_fourier_coeff(h, ft)
         
         Uh_ut_Fh_ft[ind] = (Uh, ut, Fh, ft)
@@ -202,13 +202,26 @@ class NonlinearSolver:
         scipy.linalg.eigh :
             The eigen problem solver that is called here. This just provides
             an interface that can be made consistent with different approaches.
+            
+        Notes
+        -----
+        For the generalized problem, the LAPACK driver 'gvx' is explicitly 
+        used. It only calculates the requested subset of eigenvectors rather 
+        than the full set. The standard problem uses the default driver of 
+        `scipy.linalg.eigh`, which already handles subsets.
 
         """
         
-        subset_by_index[1] = min(subset_by_index[1], K.shape[0]-1)
+        subset_by_index = [subset_by_index[0], 
+                           min(subset_by_index[1], K.shape[0]-1)]
         
-        eigvals, eigvecs = scipy.linalg.eigh(K, M, 
-                                             subset_by_index=subset_by_index)
+        if M is None:
+            eigvals, eigvecs = scipy.linalg.eigh(K, 
+                                            subset_by_index=subset_by_index)
+        else:
+            eigvals, eigvecs = scipy.linalg.eigh(K, M, 
+                                            subset_by_index=subset_by_index,
+                                            driver='gvx')
         
         return eigvals, eigvecs
     
@@ -245,10 +258,15 @@ class NonlinearSolver:
 
         """
         
+        # Combined Jacobian scaling is the same for every call, so it is 
+        # formed once here rather than applying RPtoC and CtoP separately
+        dR_scale = RPtoC*CtoP
+        
         return lambda Xc, calc_grad=True : _conditioned_fun(Xc, CtoP, RPtoC, \
-                                                            calc_grad, fun)
+                                                            calc_grad, fun, 
+                                                            dR_scale)
         
-def _conditioned_fun(Xc, CtoP, RPtoC, calc_grad, fun):
+def _conditioned_fun(Xc, CtoP, RPtoC, calc_grad, fun, dR_scale=None):
     """
     Private function for conditioned space residual / nonlinear solution.
 
@@ -269,6 +287,10 @@ def _conditioned_fun(Xc, CtoP, RPtoC, calc_grad, fun):
         `fun` always returns a tuple with the first entry being the residual 
         vector. If `calc_grad=True`, a second entry of the tuple is 
         `(N,N) numpy.ndarrray, dRdXp`
+    dR_scale : numpy.ndarray or None, optional
+        Precomputed `RPtoC*CtoP` used to scale the Jacobian. If None, it is
+        calculated from `RPtoC` and `CtoP`.
+        The default is None.
 
     Returns
     -------
@@ -285,8 +307,14 @@ def _conditioned_fun(Xc, CtoP, RPtoC, calc_grad, fun):
     if calc_grad:
         R, dRdXp = fun(Xp)[:2]
         
+        if dR_scale is None:
+            dR_scale = RPtoC*CtoP
+        
         Rc = RPtoC * R
-        dRcdXc = RPtoC*dRdXp*CtoP
+        
+        # Single pass over the Jacobian. A new array is returned since fun 
+        # may return a Jacobian that it still uses (e.g., a constant matrix)
+        dRcdXc = dRdXp*dR_scale
         
         return (Rc, dRcdXc)
         
@@ -8,7 +8,10 @@ tmdsimpy.jax.harmonic_utils :
 
 """
 
+import functools
+
 import numpy as np
+import scipy.sparse as sp
 
 def Nhc(h):
     """
@@ -40,13 +43,28 @@ def Nhc(h):
 
     """
     
+    # Same harmonics are used for every residual evaluation, so results
+    # are cached on the raw contents of h
+    h = np.asarray(h)
+    
+    return _Nhc_cached(h.tobytes(), h.dtype.str, h.shape)
+
+@functools.lru_cache(maxsize=32)
+def _Nhc_cached(h_bytes, dtype_str, shape):
+    """
+    Cached implementation of `Nhc` for the bytes, dtype, and shape of `h`.
+    """
+    
+    h = np.frombuffer(h_bytes, dtype=dtype_str).reshape(shape)
+    
     h_unique = np.unique(h)
     
     assert len(h_unique) == len(h), 'Repeated Harmonics in h are not allowed.'
    
     return 2*(h !=0).sum() + (h==0).sum()
 
-def harmonic_stiffness(M, C, K, w, h, calc_grad=True, only_C=False):
+def harmonic_stiffness(M, C, K, w, h, calc_grad=True, only_C=False, 
+                       sparse=False):
     """
     Returns the harmonic stiffness and its frequency derivative.
 
@@ -73,16 +91,20 @@ def harmonic_stiffness(M, C, K, w, h, calc_grad=True, only_C=False):
         completely ignored in this case and do not need to be passed in with 
         correct shapes or values. 
         The default is False.
+    sparse : bool, optional
+        If True, `E` and `dEdw` are returned as `scipy.sparse.bsr_matrix`
+        with blocks of size (N,N). Only the nonzero blocks are stored.
+        The default is False.
     
     Returns
     -------
-    E : (N*Nhc, N*Nhc) numpy.ndarray
+    E : (N*Nhc, N*Nhc) numpy.ndarray or scipy.sparse.bsr_matrix
         Square stiffness matrix corresponding to linear properties at every
         harmonic. Ordered as all dofs for each of harmonic component and 
         then the next component.
         If `only_C=True`, then only the damping properties are applied.
         Always returned as the first entry of a tuple.
-    dEdw : (N*Nhc, N*Nhc) numpy.ndarray
+    dEdw : (N*Nhc, N*Nhc) numpy.ndarray or scipy.sparse.bsr_matrix
         Derivative of each entry of `E` with respect to scalar frequency `w`.
         Not returned if `calc_grad=False`.
     
@@ -94,70 +116,164 @@ def harmonic_stiffness(M, C, K, w, h, calc_grad=True, only_C=False):
     The `only_C` flag is used for EPMC gradient calculations to improve 
     efficiency by eliminating unnecessary operations.  
     
+    For large numbers of harmonics, `sparse=True` avoids storing and 
+    operating on the zero blocks between harmonics.
+    
     """
     
     nd = C.shape[0]
     
     Nhc2 = Nhc(h) # Number of Harmonic Components
     
-    E = np.zeros((Nhc2*nd, Nhc2*nd))
-    
-    if calc_grad:
-        dEdw = np.zeros((Nhc2*nd, Nhc2*nd))
-    
     # Starting index for first harmonic
     zi = 1*(h[0] == 0)
     
     # apply not here so that boolean does not have to be repeatedly applied
     include_KM = not only_C
     
+    if sparse:
+        return _harmonic_stiffness_bsr(M, C, K, w, h, Nhc2, zi, 
+                                       calc_grad, include_KM)
+    
+    E = np.zeros((Nhc2*nd, Nhc2*nd))
+    
     if zi == 1 and include_KM:
         E[:nd, :nd] = K
     
-    for hind in range(zi, h.shape[0]):
+    # All blocks for nonzero harmonics are assigned at once through a view
+    # of E indexed as [component, dof, component, dof].
+    # Advanced indices on the component axes give blocks of shape 
+    # (harmonic, dof, dof)
+    E4 = E.reshape(Nhc2, nd, Nhc2, nd)
+    
+    # Float conversion so that negation works for unsigned integer types
+    # (e.g., from the MATLAB import test).
+    h_nz = (1.0*h[zi:]).reshape(-1, 1, 1)
+    
+    # Cosine and sine component indices for each nonzero harmonic
+    cos_ind = 2*np.arange(h_nz.shape[0]) + zi
+    sin_ind = cos_ind + 1
+    
+    TR = (h_nz*w)*C
+    
+    E4[cos_ind, :, sin_ind, :] = TR
+    E4[sin_ind, :, cos_ind, :] = -TR
+    
+    if include_KM:
+        # Same block for top left and bottom right
+        TL = K + (-1.0*(h_nz*w)**2)*M
         
-        TR = (1.0*h[hind]*w)*C
-        BL = (-1.0*h[hind]*w)*C
+        E4[cos_ind, :, cos_ind, :] = TL
+        E4[sin_ind, :, sin_ind, :] = TL
         
-        E[nd*(hind*2 - zi):nd*(hind*2 - zi+1), \
-          nd*(hind*2 - zi+1):nd*(hind*2 - zi+2)] = TR
-            
-        E[nd*(hind*2 - zi+1):nd*(hind*2 - zi+2), \
-          nd*(hind*2 - zi):nd*(hind*2 - zi+1)] = BL
+    if calc_grad:
+        dEdw = np.zeros((Nhc2*nd, Nhc2*nd))
         
-        if include_KM:
-            TL = K + (-1.0*(h[hind]*w)**2)*M
-            BR = K + (-1.0*(h[hind]*w)**2)*M
+        dEdw4 = dEdw.reshape(Nhc2, nd, Nhc2, nd)
         
-            E[nd*(hind*2 - zi):nd*(hind*2 - zi+1), \
-              nd*(hind*2 - zi):nd*(hind*2 - zi+1)] = TL
-            
-            E[nd*(hind*2 - zi+1):nd*(hind*2 - zi+2), \
-              nd*(hind*2 - zi+1):nd*(hind*2 - zi+2)] = BR
-            
-        if calc_grad:
-            
-            TRdw = h[hind]*C
-            BLdw = (-1.0*h[hind])*C
+        TRdw = h_nz*C
+        
+        dEdw4[cos_ind, :, sin_ind, :] = TRdw
+        dEdw4[sin_ind, :, cos_ind, :] = -TRdw
+        
+        if include_KM:
+            TLdw = (-2.0*w*(h_nz**2))*M
             
-            dEdw[nd*(hind*2 - zi):nd*(hind*2 - zi+1), \
-              nd*(hind*2 - zi+1):nd*(hind*2 - zi+2)] = TRdw
+            dEdw4[cos_ind, :, cos_ind, :] = TLdw
+            dEdw4[sin_ind, :, sin_ind, :] = TLdw
                 
-            dEdw[nd*(hind*2 - zi+1):nd*(hind*2 - zi+2), \
-              nd*(hind*2 - zi):nd*(hind*2 - zi+1)] = BLdw
-            
-            if include_KM:
+        return E, dEdw
+    else:
+        return (E,)
 
-                TLdw = (-2.0*w*(h[hind]**2))*M
-                BRdw = (-2.0*w*(h[hind]**2))*M
-            
-                dEdw[nd*(hind*2 - zi):nd*(hind*2 - zi+1), \
-                  nd*(hind*2 - zi):nd*(hind*2 - zi+1)] = TLdw
-                 
-                dEdw[nd*(hind*2 - zi+1):nd*(hind*2 - zi+2), \
-                  nd*(hind*2 - zi+1):nd*(hind*2 - zi+2)] = BRdw
-                
+def _harmonic_stiffness_bsr(M, C, K, w, h, Nhc2, zi, calc_grad, include_KM):
+    """
+    Block sparse version of `harmonic_stiffness`.
+    
+    Parameters
+    ----------
+    M : (N,N) numpy.ndarray
+        Mass Matrix
+    C : (N,N) numpy.ndarray
+        Damping Matrix
+    K : (N,N) numpy.ndarray
+        Stiffness Matrix
+    w : float
+        Frequency (fundamental/harmonic 1)
+    h : (H,) numpy.ndarray, sorted
+        List of harmonics, zeroth harmonic must be first if included.
+    Nhc2 : int
+        Number of harmonic components for `h`.
+    zi : int
+        1 if the zeroth harmonic is included, otherwise 0.
+    calc_grad : bool
+        If True, `dEdw` is also returned.
+    include_KM : bool
+        If False, `M` and `K` are ignored.
+
+    Returns
+    -------
+    E : (N*Nhc, N*Nhc) scipy.sparse.bsr_matrix
+        Harmonic stiffness with blocks of size (N,N).
+    dEdw : (N*Nhc, N*Nhc) scipy.sparse.bsr_matrix
+        Derivative of `E` with respect to `w`. 
+        Not returned if `calc_grad=False`.
+
+    """
+    
+    nd = C.shape[0]
+    
+    h_nz = (1.0*h[zi:]).reshape(-1, 1, 1)
+    
+    cos_ind = 2*np.arange(h_nz.shape[0]) + zi
+    sin_ind = cos_ind + 1
+    
+    shape = (Nhc2*nd, Nhc2*nd)
+    
+    def assemble(TL, TR, K0):
+        # Blocks are listed row by row for (cos, sin) component pairs
+        if TL is None:
+            data = np.stack((TR, -TR), axis=1)
+            indices = np.stack((sin_ind, cos_ind), axis=1)
+        else:
+            data = np.stack((TL, TR, -TR, TL), axis=1)
+            indices = np.stack((cos_ind, sin_ind, cos_ind, sin_ind), axis=1)
+        
+        blocks_per_row = data.shape[1] // 2
+        
+        data = data.reshape(-1, nd, nd)
+        indices = indices.ravel()
+        indptr = blocks_per_row*np.arange(2*h_nz.shape[0] + 1)
+        
+        if zi == 1:
+            if K0 is None:
+                # Empty block row for the zeroth harmonic
+                indptr = np.hstack((0, indptr))
+            else:
+                data = np.concatenate((K0.reshape(1, nd, nd), data), axis=0)
+                indices = np.hstack((0, indices))
+                indptr = np.hstack((0, indptr + 1))
+        
+        return sp.bsr_matrix((data, indices, indptr), shape=shape, 
+                             blocksize=(nd, nd))
+    
+    TR = (h_nz*w)*C
+    
+    if include_KM:
+        TL = K + (-1.0*(h_nz*w)**2)*M
+        E = assemble(TL, TR, 1.0*K)
+    else:
+        E = assemble(None, TR, None)
+    
     if calc_grad:
+        TRdw = h_nz*C
+        
+        if include_KM:
+            TLdw = (-2.0*w*(h_nz**2))*M
+            dEdw = assemble(TLdw, TRdw, None)
+        else:
+            dEdw = assemble(None, TRdw, None)
+        
         return E, dEdw
     else:
         return (E,)
@@ -221,45 +337,50 @@ def time_series_deriv(Nt, h, X0, order):
     assert Nt > 2*Nh + 1, 'More times are required to avoid truncating harmonics.'
     
     if order > 0:
-        D1 = np.zeros((2*Nh+1, 2*Nh+1))
-        
-        for k in h[h != 0]:
-            # Only rotates the derivatives for the non-zero harmonic components
-            cosrows = (k-1)*2 + 1
-            sinrows = (k-1)*2 + 2
-            
-            D1[cosrows, sinrows] = k
-            
-            # -k can give the wrong number if it is a positive only integer type 
-            # (e.g., from the MATLAB import test). In those cases -k != -1*k
-            D1[sinrows, cosrows] = -1*k 
-            
-        # This is not particularly fast, consider optimizing this portion.
-        #   D could be constructed just be noting if rows flip for odd/even
-        #   and sign changes as appropriate.
-        D = np.linalg.matrix_power(D1, order)
+        # Each derivative maps the (cos, sin) coefficients of harmonic k by
+        # k*[[0, 1], [-1, 0]], so the rotation repeats every 4 orders and
+        # D^order can be applied directly without forming D.
+        # Float harmonics since -k can give the wrong number for positive
+        # only integer types (e.g., from the MATLAB import test).
+        scale = ((1.0*np.arange(1, Nh+1))**order).reshape(-1, 1)
+        
+        cos_coef = X0full[1::2, :]
+        sin_coef = X0full[2::2, :]
+        
+        rot = order % 4
+        
+        if rot == 0:
+            cos_new = scale*cos_coef
+            sin_new = scale*sin_coef
+        elif rot == 1:
+            cos_new = scale*sin_coef
+            sin_new = -scale*cos_coef
+        elif rot == 2:
+            cos_new = -scale*cos_coef
+            sin_new = -scale*sin_coef
+        else:
+            cos_new = -scale*sin_coef
+            sin_new = scale*cos_coef
         
-        X0full = D @ X0full
+        # Derivatives eliminate the zeroth harmonic
+        X0full[0, :] = 0.0
+        X0full[1::2, :] = cos_new
+        X0full[2::2, :] = sin_new
     
-    # Extend X0full to have coefficients corresponding to Nt times for ifft
-    #   Previous MATLAB implementation did this before rotating harmonics, but
-    #   that seems rather inefficient in increasing the size of the matrix 
-    #   multiplication
+    # Real inverse FFT only needs the positive frequency coefficients, 
+    # the negative frequencies follow from conjugate symmetry.
     Nht = int(Nt/2 -1)
-    X0full = np.vstack((X0full,np.zeros((2*(Nht-Nh), nd)) ))
     Nt = 2*Nht+2
-
-    # Fourier Coefficients    
-    Xf = np.vstack((2*X0full[0, :], \
-         X0full[1::2, :] - 1j*X0full[2::2], \
-         np.zeros((1, nd)), \
-         X0full[-2:0:-2, :] + 1j*X0full[-1:1:-2]))
+    
+    # Fourier Coefficients (zero above Nh, including the Nyquist frequency)
+    Xf = np.zeros((Nht+2, nd), dtype=np.complex128)
+    
+    Xf[0, :] = 2*X0full[0, :]
+    Xf[1:Nh+1, :] = X0full[1::2, :] - 1j*X0full[2::2, :]
         
     Xf = Xf * (Nt/2)
-         
-    assert Xf.shape[0] == Nt, 'Unexpected length of Fourier Coefficients'
     
-    x_t = np.real(np.fft.ifft(Xf, axis=0))
+    x_t = np.fft.irfft(Xf, n=Nt, axis=0)
     
     return x_t
 
@@ -305,7 +426,8 @@ def get_fourier_coeff(h, x_t):
     
     v = np.zeros((Nhc, nd))
     
-    xf = np.fft.fft(x_t, axis=0)
+    # Only bins up to Nt/2 are used, so the real FFT is sufficient
+    xf = np.fft.rfft(x_t, axis=0)
         
     if h[0] == 0:
         v[0, :] = np.real(xf[0, :])/Nt
@@ -360,7 +482,8 @@ def harmonic_wise_conditioning(X, Ndof, h, delta=1e-4):
     
     """
     
-    m = X.shape[0] - Nhc(h)*Ndof
+    Nharm = Nhc(h)*Ndof # Number of harmonic unknowns
+    m = X.shape[0] - Nharm
     extras = m > 0
     
     # Default Conditioning level when some components are small
@@ -376,19 +499,22 @@ def harmonic_wise_conditioning(X, Ndof, h, delta=1e-4):
             # Trim off extra at end
             CtoP = CtoP[:(m-2*Ndof)]
         
-    # Loop over Harmonics and Potentially increase each harmonic
-    haszero = 0
-    for hindex in range(len(h)):
-        if h[hindex] == 0:
-            # Normalize only Ndof variables
-            inds = slice(0, Ndof)
-            haszero = 1
-            assert hindex == 0, 'Zeroth harmonic must be first.'
-        else:
-            # Normalize sine and cosine components together
-            inds = slice((2*hindex-haszero)*Ndof, (2*hindex+2-haszero)*Ndof)
-            
-        CtoP[inds] = np.maximum(CtoP[inds], np.mean(np.abs(X[inds])))
+    haszero = 1*(h[0] == 0)
+    
+    assert (h[haszero:] != 0).all(), 'Zeroth harmonic must be first.'
+    
+    # Sizes of each harmonic block, normalize only Ndof variables for the 
+    # zeroth harmonic and sine and cosine components together otherwise
+    sizes = np.full(h.shape[0], 2*Ndof)
+    sizes[:haszero] = Ndof
+    
+    offsets = np.hstack((0, np.cumsum(sizes)[:-1]))
+    
+    # Mean absolute value of every harmonic at once
+    means = np.add.reduceat(np.abs(X[:Nharm]), offsets) / sizes
+    
+    # Potentially increase each harmonic
+    np.maximum(CtoP[:Nharm], np.repeat(means, sizes), out=CtoP[:Nharm])
         
     if extras:
         CtoP[-m:] = np.maximum(CtoP[-m:], np.abs(X[-m:]))
@@ -671,16 +797,22 @@ def zero_crossing(X, zero_tol=np.Inf):
         crossings. 
         `True` should always be the first index of the two indices that are
         before and after the crossing.
-    
-    Notes
-    -----
-    This function is not tested and should be used with care.
+        Exact zeros are not counted as crossings.
 
     """
     
-    TF = X[:-1]*X[1:] < 0
-    TF = np.concatenate((TF, np.array([False])))
-    TF = np.logical_and(np.abs(X) < zero_tol, TF)
+    # Compare signs directly rather than testing X[:-1]*X[1:] < 0 so that
+    # the product cannot overflow. Strict comparisons keep exact zeros 
+    # (and NaN) from counting as crossings.
+    neg = X < 0
+    pos = X > 0
+    
+    TF = np.zeros(X.shape, dtype=bool)
+    
+    np.logical_or(np.logical_and(neg[:-1], pos[1:]), 
+                  np.logical_and(pos[:-1], neg[1:]), out=TF[:-1])
+    
+    TF[:-1] &= np.abs(X[:-1]) < zero_tol
     
     return TF
 
@@ -696,16 +828,13 @@ def shift_pm_pi(phase):
     Returns
     -------
     phase : numpy.ndarray
-        Shifted phase.
-
-    Notes
-    -----
-    This function is not tested and should be used with care.
+        Shifted phase. Input values that differ by multiples of `2*pi` 
+        give the same output.
     
     """
-    phase = np.copy(phase)
     
-    phase = ((phase + np.pi) % 2*np.pi) - np.pi
+    # Single elementwise pass, the input is not modified.
+    phase = np.remainder(phase + np.pi, 2*np.pi) - np.pi
     
     return phase
 
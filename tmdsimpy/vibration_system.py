@@ -761,10 +761,6 @@ class VibrationSystem:
         
         if calc_grad:
             dEdw = E_dEdw[1] # only exists if calc_grad=True
-            
-            dEdxi = hutils.harmonic_stiffness(0, -self.M, 0, 
-                                                w, h, calc_grad=False,
-                                                only_C=True)[0]
         
         
         ########### # OLD AFT:
@@ -810,7 +806,21 @@ class VibrationSystem:
             dRdUwx[:-2, -2] = dEdw @ (Ascale * Uwxa[:-3]) + dFnldw
             
             # d Force Balance / d xi
-            dRdUwx[:-2, -1] = dEdxi @ (Ascale * Uwxa[:-3])
+            # Equivalent to 
+            # hutils.harmonic_stiffness(0, -M, 0, w, h, only_C=True) @ Uscaled
+            # without forming the full (Nhc*Ndof, Nhc*Ndof) matrix.
+            # Only the off diagonal blocks (h*w)*(-M) and -(h*w)*(-M) 
+            # between the cosine and sine components are nonzero.
+            MUh = np.reshape(Ascale * Uwxa[:-3], (Nhc, Ndof)) @ self.M.T
+            MUh = np.reshape(MUh[h0:], (-1, 2, Ndof))
+            
+            hw = (h[h0:]*w).reshape(-1, 1)
+            
+            dRdxi = np.zeros((Nhc, Ndof))
+            dRdxi[h0:] = np.reshape(np.stack((-hw*MUh[:, 1], hw*MUh[:, 0]),
+                                             axis=1), (-1, Ndof))
+            
+            dRdUwx[:-2, -1] = np.reshape(dRdxi, (-1,))
             
             # d Amplitude Constraint / d Displacements (only 1st harmonic)
             dRdUwx[-2, h0*Ndof:(h0+1)*Ndof] = 2*Uwxa[h0*Ndof:((h0+1)*Ndof)] @ self.M